@@ -1,4 +1,4 @@
-from flask import Flask
+from flask import Flask, request
 from flask_cors import CORS
 from app.config import config
 from dotenv import load_dotenv
@@ -14,9 +14,22 @@ def create_app(config_name = None):
     config_name = config_name or os.environ.get('FLASK_ENV')
     app.config.from_object(config[config_name])
     
+    # Fast JSON serialization
+    if app.config['JSON_USE_ORJSON']:
+        from app.utils.json_provider import OrjsonProvider
+        app.json = OrjsonProvider(app)
+    
     # Initialize CORS
     CORS(app, origins=app.config['CORS_ORIGINS'])
     
+    # Size torch/BLAS thread pools before any model is loaded
+    from app.utils.cpu_threads import configure_cpu_threads
+    app.config['CPU_THREADS'] = configure_cpu_threads(
+        app.config['TORCH_NUM_THREADS'],
+        app.config['BLAS_NUM_THREADS'],
+        app.config['MATCH_CONCURRENCY']
+    )
+    
     # Create upload directory
     upload_dir = app.config['UPLOAD_FOLDER']
     if not os.path.exists(upload_dir):
@@ -48,4 +61,24 @@ def create_app(config_name = None):
     from app.routes.main import bp as main_bp
     app.register_blueprint(main_bp, url_prefix=app.config['API_PREFIX'])
     
-    return app
\ No newline at end of file
+    # 429/503 responses for requests shed by the admission controller
+    from app.utils.admission import init_admission
+    init_admission(app)
+    
+    # Opt-in and slow-request profiling
+    from app.utils.profiling import init_profiling
+    init_profiling(app)
+    
+    # Compress large responses
+    if app.config['COMPRESS_RESPONSES']:
+        from app.utils.response_utils import compress_response
+
+        @app.after_request
+        def _compress(response):
+            return compress_response(
+                response, request,
+                app.config['COMPRESS_MIN_SIZE'],
+                app.config['COMPRESS_LEVEL']
+            )
+    
+    return app
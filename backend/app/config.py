@@ -19,10 +19,28 @@ class Config:
     NLTK_DATA_PATH = os.environ.get('NLTK_DATA_PATH', './nltk_data')
     SPACY_MODEL = os.environ.get('SPACY_MODEL', 'en_core_web_sm')
     
+    # CPU Thread Configuration (0 = derive from cores / MATCH_CONCURRENCY, or library default)
+    TORCH_NUM_THREADS = int(os.environ.get('TORCH_NUM_THREADS', 0))
+    BLAS_NUM_THREADS = int(os.environ.get('BLAS_NUM_THREADS', 0))
+    MATCH_CONCURRENCY = int(os.environ.get('MATCH_CONCURRENCY', 0))
+    
     # API Configuration
     API_VERSION = os.environ.get('API_VERSION', 'v1')
     API_PREFIX = os.environ.get('API_PREFIX', '/api')
     
+    # Response Configuration
+    JSON_USE_ORJSON = os.environ.get('JSON_USE_ORJSON', 'true').lower() == 'true'
+    COMPRESS_RESPONSES = os.environ.get('COMPRESS_RESPONSES', 'true').lower() == 'true'
+    COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', 1024))
+    COMPRESS_LEVEL = int(os.environ.get('COMPRESS_LEVEL', 6))
+    
+    # Profiling Configuration
+    ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN')  # Required for explicit ?profile= / X-Profile requests
+    PROFILE_DIR = os.environ.get('PROFILE_DIR', 'profiles')
+    PROFILE_SLOW_REQUEST_MS = float(os.environ.get('PROFILE_SLOW_REQUEST_MS', 0))  # 0 disables automatic capture
+    PROFILE_SAMPLE_INTERVAL_MS = float(os.environ.get('PROFILE_SAMPLE_INTERVAL_MS', 5))
+    PROFILE_MAX_FILES = int(os.environ.get('PROFILE_MAX_FILES', 100))  # Oldest profiles are deleted beyond this; 0 keeps all
+    
     # Logging Configuration
     LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
     LOG_FILE = os.environ.get('LOG_FILE', 'logs/app.log')
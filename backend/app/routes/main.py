@@ -1,8 +1,12 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, Response, stream_with_context, current_app, send_from_directory
 import os
 from app.utils.resume_parser import ResumeParser
 from app.utils.job_processor import JobDescriptionProcessor
 from app.utils.match_engine import AIMatchEngine
+from app.utils.response_utils import shape_response
+from app.utils.streaming import stream_rankings, NDJSON_MIMETYPE, SSE_MIMETYPE
+from app.utils.profiling import is_admin, PROFILE_EXTENSIONS
+from app.utils.admission import admission, Overloaded
 
 bp = Blueprint('main', __name__)
 
@@ -13,6 +17,8 @@ match_engine = AIMatchEngine()
 stored_resume_data = None
 stored_job_data = None
 
+MIN_JOB_DESCRIPTION_LENGTH = 50
+
 @bp.route('/health', methods = ['GET'])
 def health_check():
     return jsonify({
@@ -21,7 +27,12 @@ def health_check():
         'ai_status': {
             'sentence_transformers': hasattr(match_engine, 'sentence_model') and match_engine.sentence_model is not None,
             'openai': bool(match_engine.openai_api_key)
-        }
+        },
+        'caches': {
+            'resumes': resume_parser.cache.stats(),
+            'jobs': job_processor.cache.stats()
+        },
+        'admission': admission.stats()
     })
 
 @bp.route('/upload-resume', methods = ['POST'])
@@ -47,11 +58,13 @@ def upload_resume():
 
             return jsonify({
                 'message': 'Resume uploaded and parsed successfully',
-                'data': result['data']
+                'data': shape_response(result['data'], 'resume', request.args)
             }), 200
         else:
             return jsonify({'error': result['error']}), 400
         
+    except Overloaded:
+        raise
     except Exception as e:
         return jsonify({'error': f'Server error: {str(e)}'}), 500
 
@@ -68,20 +81,23 @@ def analyze_job():
             return jsonify({'error': 'No job description provided'}), 400
         
         job_description = data['job_description']
-        if len(job_description.strip()) < 50:
-            return jsonify({'error': 'Job description too short (minimum 50 characters)'}), 400
+        if len(job_description.strip()) < MIN_JOB_DESCRIPTION_LENGTH:
+            return jsonify({'error': f'Job description too short (minimum {MIN_JOB_DESCRIPTION_LENGTH} characters)'}), 400
 
-        result = job_processor.process_job_description(job_description)  
+        # job_key identifies a posting across edits so only changed sentences are re-analyzed
+        result = job_processor.process_job_description(job_description, data.get('job_key'))  
 
         if result['success']:
             stored_job_data = result
             return jsonify({
                 'message': 'Job description analyzed successfully',
-                'data': result['data']
+                'data': shape_response(result['data'], 'job', request.args)
             }), 200
         else:
             return jsonify({'error': result['error']}), 400
     
+    except Overloaded:
+        raise
     except Exception as e:
         return jsonify({'error': f'Server error: {str(e)}'}), 500
 
@@ -101,12 +117,14 @@ def get_match_score():
                 'error': 'No job data available to calculate match score. Please analyze the job description.'
             }), 400
         
-        match_result = match_engine.calculate_comprehensive_match(stored_resume_data,stored_job_data)
+        # Optional per-request latency budget; expensive scorers are skipped if it is at risk
+        budget_ms = request.args.get('budget_ms', type = float)
+        match_result = match_engine.calculate_comprehensive_match(stored_resume_data, stored_job_data, budget_ms)
 
         if match_result['success']:
             return jsonify({
                 'message': 'Match score calculated successfully',
-                'data': match_result['data']
+                'data': shape_response(match_result['data'], 'match', request.args)
             }), 200
         else:
             return jsonify({'error': match_result['error']}), 400
@@ -114,6 +132,36 @@ def get_match_score():
     except Exception as e:
         return jsonify({'error': f'Server error: {str(e)}'}), 500
 
+@bp.route('/requirement-coverage', methods = ['POST'])
+def get_requirement_coverage():
+    """Per-requirement best evidence from the stored resume for the stored job"""
+    try:
+        if not stored_resume_data:
+            return jsonify({
+                'error': 'No resume data available to check requirements. Please upload a resume.'
+            }), 400
+        if not stored_job_data:
+            return jsonify({
+                'error': 'No job data available to check requirements. Please analyze the job description.'
+            }), 400
+
+        coverage = match_engine.calculate_requirement_coverage(
+            stored_resume_data,
+            stored_job_data,
+            request.args.get('threshold', type = float)
+        )
+
+        if coverage['success']:
+            return jsonify({
+                'message': 'Requirement coverage calculated successfully',
+                'data': shape_response(coverage['data'], 'coverage', request.args)
+            }), 200
+        else:
+            return jsonify({'error': coverage['error']}), 400
+
+    except Exception as e:
+        return jsonify({'error': f'Server error: {str(e)}'}), 500
+
 @bp.route('/match-score-custom', methods = ['POST'])
 def get_match_score_custom():
     """Calculate match score with custom resume and job data"""
@@ -140,18 +188,109 @@ def get_match_score_custom():
 
         match_result = match_engine.calculate_comprehensive_match(
             temp_resume_data,
-            temp_job_data
+            temp_job_data,
+            request.args.get('budget_ms', type = float)
         )
 
         if match_result['success']:
             return jsonify({
                 'message': 'Match score calculated successfully',
-                'data': match_result['data']
+                'data': shape_response(match_result['data'], 'match', request.args)
             }), 200
     
     except Exception as e:
         return jsonify({'error': f'Server error: {str(e)}'}), 500
 
+@bp.route('/match-stream', methods = ['POST'])
+def match_stream():
+    """Stream match scores for a pool of resumes as NDJSON or Server-Sent Events"""
+    try:
+        data = request.get_json()
+
+        if not data or not isinstance(data.get('resumes'), list):
+            return jsonify({'error': 'A list of resumes is required'}), 400
+
+        if 'job_text' in data:
+            # Same validation as /analyze-job; an empty job_text is rejected, not replaced by the stored job
+            job_text = data['job_text']
+            if not isinstance(job_text, str) or len(job_text.strip()) < MIN_JOB_DESCRIPTION_LENGTH:
+                return jsonify({'error': f'Job description too short (minimum {MIN_JOB_DESCRIPTION_LENGTH} characters)'}), 400
+            # Analyze once up front so every candidate is scored on skills and precomputed keywords
+            job_data = job_processor.process_job_description(job_text)
+            if not job_data['success']:
+                return jsonify({'error': job_data['error']}), 400
+        elif stored_job_data:
+            job_data = stored_job_data
+        else:
+            return jsonify({
+                'error': 'No job data available. Provide job_text or analyze a job description first.'
+            }), 400
+
+        mode = data.get('mode', 'pairs')
+        if mode not in ('pairs', 'topk'):
+            return jsonify({'error': "mode must be 'pairs' or 'topk'"}), 400
+
+        top_k = int(data.get('top_k', 10))
+        if top_k < 1:
+            return jsonify({'error': 'top_k must be positive'}), 400
+
+        fmt = data.get('format')
+        if not fmt:
+            fmt = 'sse' if SSE_MIMETYPE in request.headers.get('Accept', '') else 'ndjson'
+        if fmt not in ('ndjson', 'sse'):
+            return jsonify({'error': "format must be 'ndjson' or 'sse'"}), 400
+
+        def resumes():
+            for item in data['resumes']:
+                text = item.get('resume_text', '') if isinstance(item, dict) else str(item)
+                resume = {'raw_text': text}
+                if isinstance(item, dict) and item.get('id'):
+                    resume['candidate_id'] = str(item['id'])
+                yield {'data': resume}
+
+        scored = match_engine.iter_matches(resumes(), job_data)
+        body = stream_rankings(scored, mode, top_k, fmt, current_app.json.dumps)
+
+        response = Response(
+            stream_with_context(body),
+            mimetype=SSE_MIMETYPE if fmt == 'sse' else NDJSON_MIMETYPE
+        )
+        response.headers['Cache-Control'] = 'no-cache'
+        response.headers['X-Accel-Buffering'] = 'no'
+        return response
+
+    except Overloaded:
+        raise
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': f'Invalid request: {str(e)}'}), 400
+    except Exception as e:
+        return jsonify({'error': f'Server error: {str(e)}'}), 500
+
+@bp.route('/profiles', methods = ['GET'])
+def list_profiles():
+    """List stored request profiles (admin only)"""
+    if not is_admin(current_app):
+        return jsonify({'error': 'Admin token required'}), 403
+
+    profile_dir = current_app.config['PROFILE_DIR']
+    extensions = tuple(f'.{ext}' for ext in PROFILE_EXTENSIONS.values())
+    names = sorted((n for n in os.listdir(profile_dir) if n.endswith(extensions)), reverse = True)
+    return jsonify({'profiles': names})
+
+@bp.route('/profiles/<path:name>', methods = ['GET'])
+def get_profile(name):
+    """Download a stored profile (pstats or collapsed stacks, admin only)"""
+    if not is_admin(current_app):
+        return jsonify({'error': 'Admin token required'}), 403
+
+    profile_dir = os.path.abspath(current_app.config['PROFILE_DIR'])
+    if '.' not in name:
+        matches = [n for n in os.listdir(profile_dir) if n.rsplit('.', 1)[0] == name]
+        if not matches:
+            return jsonify({'error': 'Profile not found'}), 404
+        name = matches[0]
+    return send_from_directory(profile_dir, name, as_attachment = True)
+
 @bp.route('/test-ai', methods = ['GET'])
 def test_ai():
     """Test endpoints to verify AI matching"""
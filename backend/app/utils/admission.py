@@ -0,0 +1,144 @@
+# Admission control for the expensive pipeline stages (document parsing, spaCy, embeddings)
+import os
+import math
+import time
+import threading
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict
+from flask import jsonify
+
+# Stages gated by the controller; each reads ADMISSION_<STAGE>_CONCURRENCY / _QUEUE from the environment
+STAGES = ('parsing', 'spacy', 'embeddings')
+
+
+class Overloaded(Exception):
+    """Raised when a stage cannot admit more work; carries the HTTP status and a Retry-After hint"""
+
+    def __init__(self, stage: str, status: int, retry_after: int):
+        reason = 'queue full' if status == 429 else 'queue wait timed out'
+        super().__init__(f"Server busy: {stage} stage {reason}")
+        self.stage = stage
+        self.status = status
+        self.retry_after = retry_after
+
+
+class StageGate:
+    """At most ``capacity`` requests run a stage; up to ``max_queue`` more wait for a slot.
+
+    Requests beyond the queue are rejected immediately (429) and queued
+    requests that cannot start within ``max_wait_ms`` are dropped (503), so
+    work that would miss its deadline anyway never occupies a slot.
+    """
+
+    def __init__(self, name: str, capacity: int, max_queue: int, max_wait_ms: float):
+        self.name = name
+        self.capacity = capacity
+        self.max_queue = max_queue
+        self.max_wait = max_wait_ms / 1000
+        self._cond = threading.Condition()
+        self.in_flight = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.service_ms = 100.0  # running average, refined from observed stage times
+
+    def retry_after(self) -> int:
+        # Time for the current backlog to drain through the available slots
+        backlog = self.in_flight + self.waiting + 1
+        return max(1, math.ceil(backlog / self.capacity * self.service_ms / 1000))
+
+    def acquire(self):
+        with self._cond:
+            if self.waiting == 0 and self.in_flight < self.capacity:
+                self.in_flight += 1
+                self.admitted += 1
+                return
+            if self.waiting >= self.max_queue:
+                self.rejected += 1
+                raise Overloaded(self.name, 429, self.retry_after())
+
+            # New arrivals never take a slot ahead of requests already queued
+            self.waiting += 1
+            deadline = time.monotonic() + self.max_wait
+            try:
+                while self.in_flight >= self.capacity:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.timed_out += 1
+                        raise Overloaded(self.name, 503, self.retry_after())
+                    self._cond.wait(remaining)
+                self.in_flight += 1
+                self.admitted += 1
+            finally:
+                self.waiting -= 1
+
+    def release(self, elapsed_ms: float):
+        with self._cond:
+            self.in_flight -= 1
+            self.service_ms = 0.8 * self.service_ms + 0.2 * elapsed_ms
+            self._cond.notify()
+
+    @contextmanager
+    def slot(self):
+        self.acquire()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.release((time.perf_counter() - started) * 1000)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                'capacity': self.capacity,
+                'max_queue': self.max_queue,
+                'in_flight': self.in_flight,
+                'waiting': self.waiting,
+                'admitted': self.admitted,
+                'rejected': self.rejected,
+                'timed_out': self.timed_out,
+                'avg_service_ms': round(self.service_ms, 1)
+            }
+
+
+class AdmissionController:
+    """Per-stage gates shared by the parser, job processor and match engine.
+
+    Gates are only consulted on cache misses, so cached results and cheap
+    endpoints such as /health are never queued behind model work. A stage
+    with concurrency 0 is not gated.
+    """
+
+    def __init__(self, limits: Dict[str, int], max_queue: Dict[str, int], max_wait_ms: float):
+        self.gates = {
+            stage: StageGate(stage, limits[stage], max_queue.get(stage, 0), max_wait_ms)
+            for stage in STAGES if limits.get(stage, 0) > 0
+        }
+
+    @classmethod
+    def from_env(cls):
+        limits = {stage: int(os.getenv(f'ADMISSION_{stage.upper()}_CONCURRENCY', 0)) for stage in STAGES}
+        queues = {stage: int(os.getenv(f'ADMISSION_{stage.upper()}_QUEUE', 2 * limits[stage])) for stage in STAGES}
+        return cls(limits, queues, float(os.getenv('ADMISSION_MAX_WAIT_MS', 2000)))
+
+    def slot(self, stage: str):
+        gate = self.gates.get(stage)
+        return gate.slot() if gate else nullcontext()
+
+    def stats(self) -> Dict[str, Any]:
+        return {stage: gate.stats() for stage, gate in self.gates.items()}
+
+
+admission = AdmissionController.from_env()
+
+
+def overloaded_response(error: Overloaded):
+    response = jsonify({'error': str(error), 'stage': error.stage, 'retry_after': error.retry_after})
+    response.status_code = error.status
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response
+
+
+def init_admission(app):
+    app.register_error_handler(Overloaded, overloaded_response)
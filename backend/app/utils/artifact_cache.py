@@ -0,0 +1,98 @@
+# Content-hash keyed cache for parse and NLP analysis results
+import os
+import json
+import hashlib
+import threading
+from typing import Any, Dict, Optional
+from app.utils.lru import LRUCache
+
+
+def content_hash(data) -> str:
+    """Full SHA-256 of text or bytes, used as the cache key"""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return hashlib.sha256(data or b'').hexdigest()
+
+
+def version_tag(*parts) -> str:
+    """Short hash of everything that affects an artifact (code version, taxonomy, model)"""
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:12]
+
+
+class ArtifactCache:
+    """Bounded in-memory LRU, optionally backed by JSON files on disk.
+
+    Entries are stored under ``version`` so that changing the parser, skill
+    taxonomy or spaCy model yields a new version and old entries simply stop
+    being found (in memory and on disk).
+    """
+
+    def __init__(self, namespace: str, version: str, max_entries: int = 1024,
+                 disk_dir: Optional[str] = None):
+        self.namespace = namespace
+        self.version = version
+        self.max_entries = max_entries
+        self._entries = LRUCache(max_entries)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        self.disk_dir = None
+        if disk_dir:
+            self.disk_dir = os.path.join(disk_dir, namespace, version)
+            os.makedirs(self.disk_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, key[:2], f"{key}.json")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        value = self._entries.get(key)
+        if value is not None:
+            with self._lock:
+                self.hits += 1
+            return value
+
+        if self.disk_dir:
+            try:
+                with open(self._path(key), 'r', encoding='utf-8') as f:
+                    value = json.load(f)
+            except (OSError, ValueError):
+                value = None
+            if value is not None:
+                self._entries.set(key, value)
+                with self._lock:
+                    self.hits += 1
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key: str, value: Dict[str, Any]):
+        self._entries.set(key, value)
+        if self.disk_dir:
+            path = self._path(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(value, f, default=str)
+                os.replace(tmp_path, path)
+            except (OSError, TypeError, ValueError) as e:
+                print(f"Artifact cache write failed: {e}")
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'namespace': self.namespace,
+            'version': self.version,
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'persistent': self.disk_dir is not None
+        }
@@ -0,0 +1,313 @@
+# Offline batch scoring of resume/job pairs over JSONL or Parquet corpora
+import os
+import json
+import time
+import multiprocessing
+from multiprocessing import shared_memory
+from typing import Dict, List, Tuple, Any, Optional
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+    print("pyarrow not available")
+
+OUTPUT_COLUMNS = [
+    'resume_id', 'job_id', 'overall_score',
+    'tfidf_similarity', 'ai_similarity', 'skill_match', 'keyword_coverage'
+]
+
+
+def read_documents(path: str, id_field: str = 'id', text_field: str = 'text') -> List[Tuple[str, str]]:
+    """Load (id, text) records from a .jsonl or .parquet file"""
+    if path.endswith('.parquet'):
+        if not PYARROW_AVAILABLE:
+            raise ValueError("Reading Parquet requires pyarrow")
+        table = pq.read_table(path, columns=[id_field, text_field])
+        ids = table.column(id_field).to_pylist()
+        texts = table.column(text_field).to_pylist()
+        return [(str(doc_id), text or '') for doc_id, text in zip(ids, texts)]
+
+    documents = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                documents.append((str(record[id_field]), record.get(text_field) or ''))
+            except (ValueError, KeyError) as e:
+                raise ValueError(f"{path}:{line_number}: invalid record ({e})")
+    return documents
+
+
+def read_pairs(path: str, resume_index: Dict[str, int], job_index: Dict[str, int]) -> Tuple[np.ndarray, np.ndarray]:
+    """Load explicit (resume_id, job_id) pairs as index arrays"""
+    resume_rows, job_rows = [], []
+    for resume_id, job_id in _iter_pairs(path):
+        if resume_id in resume_index and job_id in job_index:
+            resume_rows.append(resume_index[resume_id])
+            job_rows.append(job_index[job_id])
+    return np.array(resume_rows, dtype=np.int64), np.array(job_rows, dtype=np.int64)
+
+
+def _iter_pairs(path):
+    if path.endswith('.parquet'):
+        table = pq.read_table(path, columns=['resume_id', 'job_id'])
+        yield from zip(map(str, table.column('resume_id').to_pylist()), map(str, table.column('job_id').to_pylist()))
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                yield str(record['resume_id']), str(record['job_id'])
+
+
+class SharedMatrix:
+    """A float32 matrix in shared memory that worker processes attach to without copying"""
+
+    def __init__(self, shm: shared_memory.SharedMemory, shape: Tuple[int, int], owner: bool):
+        self.shm = shm
+        self.shape = shape
+        self.owner = owner
+        self.array = np.ndarray(shape, dtype=np.float32, buffer=shm.buf)
+
+    @classmethod
+    def create(cls, matrix: np.ndarray) -> 'SharedMatrix':
+        matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+        shm = shared_memory.SharedMemory(create=True, size=max(matrix.nbytes, 1))
+        shared = cls(shm, matrix.shape, owner=True)
+        shared.array[:] = matrix
+        return shared
+
+    @classmethod
+    def attach(cls, name: str, shape: Tuple[int, int]) -> 'SharedMatrix':
+        return cls(shared_memory.SharedMemory(name=name), shape, owner=False)
+
+    @property
+    def handle(self) -> Tuple[str, Tuple[int, int]]:
+        return self.shm.name, self.shape
+
+    def close(self):
+        self.array = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def embed_corpus(engine, texts: List[str], batch_size: int) -> Optional[np.ndarray]:
+    """Embed normalized texts in large batches; None when no embedding model is configured"""
+    if not engine.sentence_model:
+        return None
+    normalized = [engine.get_document(text).text for text in texts]
+    return engine.get_embeddings_sentence_transformer(normalized, batch_size=batch_size).astype(np.float32)
+
+
+# Per-process state for pool workers, set once by _init_worker
+_worker = {}
+
+
+def _init_worker(resumes, jobs, resume_handle, job_handle):
+    # Workers never load the embedding model: vectors come from shared memory
+    os.environ['USE_SENTENCE_TRANSFORMERS'] = 'false'
+    os.environ['MATCH_CACHE_SIZE'] = '0'
+    os.environ['DOCUMENT_CACHE_SIZE'] = str(len(jobs) + 64)
+    os.environ['EMBEDDING_CACHE_SIZE'] = str(len(jobs) + 64)
+    from app.utils.match_engine import AIMatchEngine
+
+    _worker['engine'] = AIMatchEngine()
+    _worker['resumes'] = resumes
+    _worker['jobs'] = jobs
+    _worker['resume_vectors'] = SharedMatrix.attach(*resume_handle) if resume_handle else None
+    _worker['job_vectors'] = SharedMatrix.attach(*job_handle) if job_handle else None
+
+
+def _score_chunk(task):
+    chunk_index, resume_rows, job_rows, part_path = task
+    engine = _worker['engine']
+    resumes, jobs = _worker['resumes'], _worker['jobs']
+    resume_vectors, job_vectors = _worker['resume_vectors'], _worker['job_vectors']
+
+    columns = {name: [] for name in OUTPUT_COLUMNS}
+    for r, j in zip(resume_rows, job_rows):
+        resume_data, job_data = resumes[r], jobs[j]
+        if resume_vectors is not None:
+            engine.preload_embeddings(
+                [resume_data['data']['raw_text'], job_data['data']['original_text']],
+                [resume_vectors.array[r], job_vectors.array[j]]
+            )
+        result = engine.calculate_comprehensive_match(resume_data, job_data)
+        data = result.get('data', {})
+        scores = data.get('scores', {})
+        columns['resume_id'].append(resume_data['corpus_id'])
+        columns['job_id'].append(job_data['corpus_id'])
+        columns['overall_score'].append(data.get('overall_score') if result['success'] else None)
+        for name in OUTPUT_COLUMNS[3:]:
+            columns[name].append(scores.get(name))
+
+    write_part(columns, part_path)
+    return chunk_index, len(resume_rows)
+
+
+def write_part(columns: Dict[str, List[Any]], part_path: str):
+    """Write one output part atomically so a crash never leaves a half-written checkpoint"""
+    # Dot-prefixed so dataset readers skip it while it is being written
+    directory, filename = os.path.split(part_path)
+    tmp_path = os.path.join(directory, f".{filename}.tmp")
+    if PYARROW_AVAILABLE:
+        table = pa.table({
+            'resume_id': pa.array(columns['resume_id'], pa.string()),
+            'job_id': pa.array(columns['job_id'], pa.string()),
+            **{name: pa.array(columns[name], pa.float32()) for name in OUTPUT_COLUMNS[2:]}
+        })
+        pq.write_table(table, tmp_path, compression='zstd')
+    else:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(','.join(OUTPUT_COLUMNS) + '\n')
+            for row in zip(*(columns[name] for name in OUTPUT_COLUMNS)):
+                f.write(','.join('' if v is None else str(v) for v in row) + '\n')
+    os.replace(tmp_path, part_path)
+
+
+class BatchScorer:
+    """Score resume/job pairs across worker processes with chunk-level checkpoints.
+
+    Every chunk of ``chunk_size`` pairs is written as its own output part; on
+    restart, chunks whose part already exists are skipped. The manifest records
+    the inputs so a resumed run cannot silently mix results from different data.
+    """
+
+    def __init__(self, output_dir: str, workers: int = None, chunk_size: int = 50000,
+                 embed_batch_size: int = 256, id_field: str = 'id', text_field: str = 'text'):
+        self.output_dir = output_dir
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.embed_batch_size = embed_batch_size
+        self.id_field = id_field
+        self.text_field = text_field
+        self.extension = 'parquet' if PYARROW_AVAILABLE else 'csv'
+
+    def _manifest(self, resumes_path, jobs_path, pairs_path, total_pairs):
+        def fingerprint(path):
+            if not path:
+                return None
+            stat = os.stat(path)
+            return {'path': os.path.abspath(path), 'size': stat.st_size, 'mtime': int(stat.st_mtime)}
+        return {
+            'resumes': fingerprint(resumes_path),
+            'jobs': fingerprint(jobs_path),
+            'pairs': fingerprint(pairs_path),
+            'total_pairs': int(total_pairs),
+            'chunk_size': self.chunk_size,
+            'format': self.extension
+        }
+
+    def _check_manifest(self, manifest):
+        path = os.path.join(self.output_dir, '_manifest.json')
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                previous = json.load(f)
+            if previous != manifest:
+                raise ValueError(
+                    f"{self.output_dir} holds results for different inputs; use a new output directory"
+                )
+        else:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, indent=2)
+
+    def run(self, resumes_path: str, jobs_path: str, pairs_path: str = None) -> Dict[str, Any]:
+        from app.utils.job_processor import JobDescriptionProcessor
+        from app.utils.match_engine import AIMatchEngine
+        from app.utils.resume_parser import ResumeParser
+
+        started = time.perf_counter()
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        resume_docs = read_documents(resumes_path, self.id_field, self.text_field)
+        job_docs = read_documents(jobs_path, self.id_field, self.text_field)
+
+        if pairs_path:
+            resume_index = {doc_id: i for i, (doc_id, _) in enumerate(resume_docs)}
+            job_index = {doc_id: i for i, (doc_id, _) in enumerate(job_docs)}
+            resume_rows, job_rows = read_pairs(pairs_path, resume_index, job_index)
+            total_pairs = len(resume_rows)
+        else:
+            resume_rows = job_rows = None
+            total_pairs = len(resume_docs) * len(job_docs)
+
+        manifest = self._manifest(resumes_path, jobs_path, pairs_path, total_pairs)
+        self._check_manifest(manifest)
+
+        chunk_count = -(-total_pairs // self.chunk_size)
+        pending = [
+            i for i in range(chunk_count)
+            if not os.path.exists(self._part_path(i))
+        ]
+        print(f"{total_pairs} pairs in {chunk_count} chunks, {chunk_count - len(pending)} already done")
+        if not pending:
+            return {'pairs': total_pairs, 'chunks': chunk_count, 'scored_chunks': 0, 'output_dir': self.output_dir}
+
+        # Same preprocessing as the web app, done once per document in the parent
+        cleaner = ResumeParser()
+        job_processor = JobDescriptionProcessor()
+        resumes = [
+            {'corpus_id': doc_id, 'data': {'raw_text': cleaner.clean_text(text), 'resume_id': f"corpus:{doc_id}"}}
+            for doc_id, text in resume_docs
+        ]
+        jobs = []
+        for doc_id, text in job_docs:
+            analysis = job_processor.process_job_description(text)
+            data = dict(analysis.get('data') or {'original_text': text, 'skills': {}})
+            jobs.append({'corpus_id': doc_id, 'data': data})
+
+        engine = AIMatchEngine()
+        resume_matrix = embed_corpus(engine, [r['data']['raw_text'] for r in resumes], self.embed_batch_size)
+        job_matrix = embed_corpus(engine, [j['data']['original_text'] for j in jobs], self.embed_batch_size)
+        del engine
+
+        shared = []
+        try:
+            resume_handle = job_handle = None
+            if resume_matrix is not None and job_matrix is not None:
+                shared = [SharedMatrix.create(resume_matrix), SharedMatrix.create(job_matrix)]
+                resume_handle, job_handle = shared[0].handle, shared[1].handle
+                del resume_matrix, job_matrix
+
+            tasks = (self._task(i, resume_rows, job_rows, len(job_docs), total_pairs) for i in pending)
+            done = 0
+            with multiprocessing.Pool(
+                processes=self.workers,
+                initializer=_init_worker,
+                initargs=(resumes, jobs, resume_handle, job_handle)
+            ) as pool:
+                for chunk_index, rows in pool.imap_unordered(_score_chunk, tasks):
+                    done += 1
+                    print(f"chunk {chunk_index} done ({rows} pairs, {done}/{len(pending)})")
+        finally:
+            for matrix in shared:
+                matrix.close()
+
+        return {
+            'pairs': total_pairs,
+            'chunks': chunk_count,
+            'scored_chunks': len(pending),
+            'output_dir': self.output_dir,
+            'seconds': round(time.perf_counter() - started, 2)
+        }
+
+    def _part_path(self, chunk_index: int) -> str:
+        return os.path.join(self.output_dir, f"part-{chunk_index:06d}.{self.extension}")
+
+    def _task(self, chunk_index, resume_rows, job_rows, job_count, total_pairs):
+        start = chunk_index * self.chunk_size
+        stop = min(start + self.chunk_size, total_pairs)
+        if resume_rows is not None:
+            rows = (resume_rows[start:stop], job_rows[start:stop])
+        else:
+            # Cross product: pair p is (resume p // job_count, job p % job_count)
+            pair_ids = np.arange(start, stop, dtype=np.int64)
+            rows = (pair_ids // job_count, pair_ids % job_count)
+        return chunk_index, rows[0], rows[1], self._part_path(chunk_index)
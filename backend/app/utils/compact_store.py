@@ -0,0 +1,298 @@
+# Compact columnar storage for large corpora of parsed documents
+import sys
+import zlib
+import threading
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import numpy as np
+
+from app.utils.normalized_text import normalize_document
+
+
+class Vocabulary:
+    """Interned string table mapping each distinct term to a dense integer id"""
+
+    def __init__(self):
+        self.terms: List[str] = []
+        self.index: Dict[str, int] = {}
+
+    def __len__(self):
+        return len(self.terms)
+
+    def intern(self, term: str) -> int:
+        term_id = self.index.get(term)
+        if term_id is None:
+            term_id = len(self.terms)
+            term = sys.intern(term)
+            self.terms.append(term)
+            self.index[term] = term_id
+        return term_id
+
+    def encode(self, terms) -> array:
+        return array('I', (self.intern(t) for t in terms))
+
+    def decode(self, ids) -> List[str]:
+        terms = self.terms
+        return [terms[i] for i in ids]
+
+
+class CompactDocument:
+    """Lightweight view of one stored document; fields are rehydrated on access"""
+    __slots__ = ('corpus', 'row')
+
+    def __init__(self, corpus: 'CompactCorpus', row: int):
+        self.corpus = corpus
+        self.row = row
+
+    @property
+    def doc_id(self) -> str:
+        return self.corpus.ids[self.row]
+
+    @property
+    def text(self) -> str:
+        return self.corpus.row_text(self.row)
+
+    @property
+    def tokens(self) -> List[str]:
+        return self.corpus.vocabulary.decode(self.corpus.row_token_ids(self.row))
+
+    @property
+    def sentences(self) -> List[str]:
+        return self.corpus.row_sentences(self.row)
+
+    @property
+    def entities(self) -> List[Dict[str, str]]:
+        return self.corpus.row_entities(self.row)
+
+    @property
+    def embedding(self) -> Optional[np.ndarray]:
+        return self.corpus.row_embedding(self.row)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Rehydrate the parse_resume result layout"""
+        corpus, row = self.corpus, self.row
+        filename, file_type, emails, phones = corpus._meta[row]
+        return {
+            'success': True,
+            'filename': filename,
+            'file_type': file_type,
+            'data': {
+                'resume_id': corpus.ids[row],
+                'raw_text': self.text,
+                'word_count': corpus._word_counts[row],
+                'char_count': corpus._char_counts[row],
+                'emails': list(emails),
+                'phones': list(phones)
+            }
+        }
+
+
+class CompactCorpus:
+    """Append-only, column-oriented store for 100k+ parsed documents.
+
+    Instead of one nested dict per document (raw text, token list, sentence
+    list and entity dicts as separate Python objects), every field lives in a
+    shared column:
+
+    - text: zlib-compressed UTF-8, decompressed only when read
+    - tokens: ids into an interned Vocabulary, concatenated in one uint32 buffer
+    - sentences: (start, end) character offsets into the text
+    - entities: (text id, label id) pairs into a second interned string table
+    - embeddings: one float16 matrix, returned as float32 rows
+    """
+
+    def __init__(self, embedding_dim: Optional[int] = None, compress_level: int = 6):
+        self.compress_level = compress_level
+        self.vocabulary = Vocabulary()
+        self.strings = Vocabulary()  # entity texts, labels and descriptions
+        self.ids: List[str] = []
+        self.index: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        self._texts: List[bytes] = []
+        self._word_counts = array('I')
+        self._char_counts = array('I')
+        self._meta: List[Tuple] = []
+
+        self._token_ids = array('I')
+        self._token_offsets = array('Q', [0])
+        self._sentence_spans = array('I')
+        self._sentence_offsets = array('Q', [0])
+        self._entity_pairs = array('I')
+        self._entity_offsets = array('Q', [0])
+        self._descriptions: Dict[int, int] = {}
+
+        self.embedding_dim = embedding_dim
+        self._embeddings = None
+        self._has_embedding = array('B')
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, doc_id):
+        return doc_id in self.index
+
+    def items(self) -> Iterator[Tuple[str, str]]:
+        """(doc_id, text) pairs, e.g. for ShardedRanker.build"""
+        for row, doc_id in enumerate(self.ids):
+            yield doc_id, self.row_text(row)
+
+    def add(self, doc_id: str, text: str, tokens: List[str] = None, sentences: List[str] = None,
+            entities: List[Dict[str, str]] = None, embedding=None, filename: str = None,
+            file_type: str = None, emails: List[str] = (), phones: List[str] = ()) -> int:
+        """Store one document; tokens default to its NormalizedDocument tokens"""
+        text = text or ""
+        if tokens is None:
+            tokens = normalize_document(text).tokens
+
+        # Sentences are kept as offsets, so only spans found verbatim in the text are stored
+        spans = array('I')
+        pos = 0
+        for sentence in sentences or []:
+            start = text.find(sentence, pos)
+            if start < 0:
+                continue
+            pos = start + len(sentence)
+            spans.extend((start, pos))
+
+        vector = np.asarray(embedding, dtype=np.float16).ravel() if embedding is not None else None
+
+        with self._lock:
+            if doc_id in self.index:
+                return self.index[doc_id]
+            if vector is not None:
+                if self.embedding_dim is None:
+                    self.embedding_dim = len(vector)
+                elif len(vector) != self.embedding_dim:
+                    raise ValueError(f"Embedding has {len(vector)} dimensions, expected {self.embedding_dim}")
+
+            pairs = array('I')
+            for entity in entities or []:
+                label_id = self.strings.intern(entity['label'])
+                pairs.extend((self.strings.intern(entity['text']), label_id))
+                if entity.get('description') and label_id not in self._descriptions:
+                    self._descriptions[label_id] = self.strings.intern(entity['description'])
+
+            row = len(self.ids)
+            self.ids.append(doc_id)
+            self.index[doc_id] = row
+            self._texts.append(zlib.compress(text.encode('utf-8'), self.compress_level))
+            self._word_counts.append(len(text.split()))
+            self._char_counts.append(len(text))
+            self._meta.append((
+                sys.intern(filename) if filename else None,
+                sys.intern(file_type) if file_type else None,
+                tuple(emails),
+                tuple(phones)
+            ))
+
+            self._token_ids.extend(self.vocabulary.encode(tokens))
+            self._token_offsets.append(len(self._token_ids))
+            self._sentence_spans.extend(spans)
+            self._sentence_offsets.append(len(self._sentence_spans))
+            self._entity_pairs.extend(pairs)
+            self._entity_offsets.append(len(self._entity_pairs))
+            self._store_embedding(row, vector)
+            return row
+
+    def add_resume(self, result: Dict[str, Any], embedding=None, sentences: List[str] = None,
+                   entities: List[Dict[str, str]] = None) -> int:
+        """Store a ResumeParser.parse_resume result"""
+        data = result['data']
+        return self.add(
+            data['resume_id'],
+            data.get('raw_text', ''),
+            sentences=sentences,
+            entities=entities,
+            embedding=embedding,
+            filename=result.get('filename'),
+            file_type=result.get('file_type'),
+            emails=data.get('emails', ()),
+            phones=data.get('phones', ())
+        )
+
+    def _store_embedding(self, row: int, vector: Optional[np.ndarray]):
+        if vector is None:
+            self._has_embedding.append(0)
+            if self._embeddings is not None and row >= len(self._embeddings):
+                self._grow_embeddings(row + 1)
+            return
+
+        if self._embeddings is None or row >= len(self._embeddings):
+            self._grow_embeddings(row + 1)
+        self._embeddings[row] = vector
+        self._has_embedding.append(1)
+
+    def _grow_embeddings(self, min_rows: int):
+        capacity = max(min_rows, 1024, 2 * (len(self._embeddings) if self._embeddings is not None else 0))
+        grown = np.zeros((capacity, self.embedding_dim), dtype=np.float16)
+        if self._embeddings is not None:
+            grown[:len(self._embeddings)] = self._embeddings
+        self._embeddings = grown
+
+    def get(self, doc_id: str) -> Optional[CompactDocument]:
+        row = self.index.get(doc_id)
+        return CompactDocument(self, row) if row is not None else None
+
+    def row_text(self, row: int) -> str:
+        return zlib.decompress(self._texts[row]).decode('utf-8')
+
+    def row_token_ids(self, row: int) -> np.ndarray:
+        start, end = self._token_offsets[row], self._token_offsets[row + 1]
+        # Slice first: a view over the live buffer would stop the column from growing
+        return np.frombuffer(self._token_ids[start:end], dtype=np.uint32)
+
+    def row_sentences(self, row: int) -> List[str]:
+        start, end = self._sentence_offsets[row], self._sentence_offsets[row + 1]
+        if start == end:
+            return []
+        text = self.row_text(row)
+        spans = self._sentence_spans
+        return [text[spans[i]:spans[i + 1]] for i in range(start, end, 2)]
+
+    def row_entities(self, row: int) -> List[Dict[str, str]]:
+        start, end = self._entity_offsets[row], self._entity_offsets[row + 1]
+        strings, pairs = self.strings.terms, self._entity_pairs
+        entities = []
+        for i in range(start, end, 2):
+            label_id = pairs[i + 1]
+            description = self._descriptions.get(label_id)
+            entities.append({
+                'text': strings[pairs[i]],
+                'label': strings[label_id],
+                'description': strings[description] if description is not None else None
+            })
+        return entities
+
+    def row_embedding(self, row: int) -> Optional[np.ndarray]:
+        if not self._has_embedding[row]:
+            return None
+        return self._embeddings[row].astype(np.float32)
+
+    def embedding_matrix(self) -> Optional[np.ndarray]:
+        """float16 embeddings for every row (zeros where none were stored)"""
+        if self._embeddings is None:
+            return None
+        return self._embeddings[:len(self.ids)]
+
+    def memory_usage(self) -> Dict[str, int]:
+        """Approximate bytes held by each column"""
+        def array_bytes(a):
+            return a.buffer_info()[1] * a.itemsize
+
+        usage = {
+            'text': sum(sys.getsizeof(t) for t in self._texts) + sys.getsizeof(self._texts),
+            'tokens': array_bytes(self._token_ids) + array_bytes(self._token_offsets),
+            'vocabulary': sum(sys.getsizeof(t) for t in self.vocabulary.terms)
+                          + sys.getsizeof(self.vocabulary.index) + sys.getsizeof(self.vocabulary.terms),
+            'sentences': array_bytes(self._sentence_spans) + array_bytes(self._sentence_offsets),
+            'entities': array_bytes(self._entity_pairs) + array_bytes(self._entity_offsets)
+                        + sum(sys.getsizeof(t) for t in self.strings.terms),
+            'embeddings': self._embeddings.nbytes if self._embeddings is not None else 0,
+            'metadata': sys.getsizeof(self.ids) + sum(sys.getsizeof(i) for i in self.ids)
+                        + sys.getsizeof(self.index) + sys.getsizeof(self._meta)
+                        + len(self._meta) * sys.getsizeof((None,) * 4)
+                        + array_bytes(self._word_counts) + array_bytes(self._char_counts)
+        }
+        usage['total'] = sum(usage.values())
+        return usage
@@ -0,0 +1,48 @@
+# Process-wide control of the CPU thread pools used by PyTorch and BLAS
+import os
+
+try:
+    import torch
+    TORCH_AVAILABLE = True
+except ImportError:
+    TORCH_AVAILABLE = False
+
+try:
+    from threadpoolctl import threadpool_limits
+    THREADPOOLCTL_AVAILABLE = True
+except ImportError:
+    THREADPOOLCTL_AVAILABLE = False
+
+
+def configure_cpu_threads(torch_threads: int = None, blas_threads: int = None,
+                          match_concurrency: int = None) -> dict:
+    """Size the torch and BLAS pools so concurrent requests do not oversubscribe cores.
+
+    When a pool size is not given it defaults to cores / match_concurrency, so
+    N concurrent matches each get an equal share of the machine.
+    """
+    cores = os.cpu_count() or 1
+    share = max(1, cores // match_concurrency) if match_concurrency else None
+    torch_threads = torch_threads or share
+    blas_threads = blas_threads or share
+
+    applied = {'cores': cores, 'torch_threads': None, 'blas_threads': None}
+
+    if torch_threads and TORCH_AVAILABLE:
+        torch.set_num_threads(torch_threads)
+        try:
+            torch.set_num_interop_threads(1)
+        except RuntimeError:
+            # Only allowed before the first parallel torch op
+            pass
+        applied['torch_threads'] = torch.get_num_threads()
+
+    if blas_threads:
+        # Covers libraries loaded later in this process that read the environment
+        for var in ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS'):
+            os.environ[var] = str(blas_threads)
+        if THREADPOOLCTL_AVAILABLE:
+            threadpool_limits(limits=blas_threads, user_api='blas')
+        applied['blas_threads'] = blas_threads
+
+    return applied
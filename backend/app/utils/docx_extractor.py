@@ -0,0 +1,64 @@
+# Streaming DOCX text extraction straight from word/document.xml
+import zipfile
+from typing import Iterator
+from xml.etree.ElementTree import iterparse
+
+W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_P = W_NS + 'p'
+_T = W_NS + 't'
+_TAB = W_NS + 'tab'
+_BR = W_NS + 'br'
+_CR = W_NS + 'cr'
+_TC = W_NS + 'tc'
+_TBL = W_NS + 'tbl'
+_BODY = W_NS + 'body'
+
+
+def iter_docx_blocks(file_path: str) -> Iterator[str]:
+    """Yield body paragraphs and table cells in document order.
+
+    Only word/document.xml is read from the archive, so embedded images and
+    other media are never decompressed. Elements are cleared as soon as they
+    are consumed, keeping memory flat for long documents.
+    """
+    with zipfile.ZipFile(file_path) as archive:
+        with archive.open('word/document.xml') as xml:
+            body = None
+            parts = []
+            cells = []  # stack of open table cells (tables can nest)
+
+            for event, elem in iterparse(xml, events=('start', 'end')):
+                tag = elem.tag
+                if event == 'start':
+                    if tag == _TC:
+                        cells.append([])
+                    elif tag == _BODY:
+                        body = elem
+                    continue
+
+                if tag == _T:
+                    parts.append(elem.text or '')
+                elif tag == _TAB:
+                    parts.append('\t')
+                elif tag in (_BR, _CR):
+                    parts.append('\n')
+                elif tag == _P:
+                    text = ''.join(parts)
+                    parts = []
+                    if cells:
+                        if text:
+                            cells[-1].append(text)
+                    else:
+                        yield text
+                elif tag == _TC:
+                    cell = ' '.join(cells.pop())
+                    if cell:
+                        yield cell
+
+                # Drop finished top-level blocks so the tree never grows with the document
+                if body is not None and not cells and tag in (_P, _TBL):
+                    body.clear()
+
+
+def extract_docx_text(file_path: str) -> str:
+    return '\n'.join(iter_docx_blocks(file_path))
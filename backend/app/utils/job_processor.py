@@ -3,11 +3,42 @@ import re
 import nltk
 import spacy
 from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize, sent_tokenize
+from nltk.tokenize import sent_tokenize
+import os
+import json
 from collections import Counter
+from app.utils.text_hash import content_id
+from app.utils.keywords import keyword_terms, top_keywords
+from app.utils.normalized_text import NormalizedDocument, normalize_document, normalize_text, collapse_whitespace
+from app.utils.artifact_cache import ArtifactCache, content_hash, version_tag
+from app.utils.lru import LRUCache
+from app.utils.admission import admission, Overloaded
+
+# Bump when analysis output changes so cached results are invalidated
+PROCESSOR_VERSION = 4
+
+# Line breaks, bullet markers and sentence ends delimit the segments diffed between versions of a posting
+_SEGMENT_SPLIT = re.compile(r'\s*\n\s*|(?<=[.!?;])\s+|(?:^|\s)[•·▪●◦]\s+')
+
+# Per-segment counts summed into a posting's totals
+COUNT_FIELDS = ('token_counts', 'keyword_counts', 'skill_counts')
+
+#Common technical skills
+TECH_SKILLS = {
+    'programming_languages': ['python', 'java', 'c++', 'javascript', 'c#', 'ruby', 'swift', 'php', 'go', 'rust', 'kotlin'],
+    'frameworks': ['react', 'angular', 'vue', 'django', 'flask', 'spring', 'express', 'ruby on rails', 'node.js', 'laravel'],
+    'databases': ['mysql', 'mongodb', 'postgresql', 'sqlite', 'oracle', 'redis', 'elasticsearch'],
+    'cloud_patforms': ['aws', 'azure', 'google cloud', 'ibm cloud', 'oracle cloud', 'gcp', 'docker', 'kubernetes', 'heroku'],
+    'operating_systems': ['windows', 'linux', 'macos', 'unix'],
+    'tools': ['git', 'github', 'jira', 'trello', 'jenkins', 'maven', 'gradle', 'npm', 'yarn', 'terraform', 'ansible', 'docker', 'kubernetes']
+}
 
 class JobDescriptionProcessor:
     def __init__(self):
+        # Per-sentence analysis reused across edits of the same posting
+        self._segment_cache = LRUCache(int(os.getenv('JOB_SEGMENT_CACHE_SIZE', 20000)))
+        self._job_versions = LRUCache(int(os.getenv('JOB_MAX_TRACKED', 1000)))
+
         try:
             self.nlp = spacy.load("en_core_web_trf")
         except OSError:
@@ -20,16 +51,29 @@ class JobDescriptionProcessor:
             print("NLTK stopwords not found.")
             self.stop_words = set()
         
-        #Common technical skills
-        self.tech_skills = {
-            'programming_languages': ['python', 'java', 'c++', 'javascript', 'c#', 'ruby', 'swift', 'php', 'go', 'rust', 'kotlin'],
-            'frameworks': ['react', 'angular', 'vue', 'django', 'flask', 'spring', 'express', 'ruby on rails', 'node.js', 'laravel'],
-            'databases': ['mysql', 'mongodb', 'postgresql', 'sqlite', 'oracle', 'redis', 'elasticsearch'],
-            'cloud_patforms': ['aws', 'azure', 'google cloud', 'ibm cloud', 'oracle cloud', 'gcp', 'docker', 'kubernetes', 'heroku'],
-            'operating_systems': ['windows', 'linux', 'macos', 'unix'],
-            'tools': ['git', 'github', 'jira', 'trello', 'jenkins', 'maven', 'gradle', 'npm', 'yarn', 'terraform', 'ansible', 'docker', 'kubernetes']
-        }
+        self.tech_skills = TECH_SKILLS
         self.degrees = {"Bachelor's", "Master's", "PhD", "BSc", "MSc"}
+
+        # Analyses keyed by job text hash, versioned on code, taxonomy and spaCy model
+        self.cache = ArtifactCache(
+            'jobs',
+            version_tag(
+                PROCESSOR_VERSION,
+                self.model_tag(),
+                self.tech_skills,
+                sorted(self.degrees),
+                len(self.stop_words)
+            ),
+            max_entries=int(os.getenv('ARTIFACT_CACHE_SIZE', 1024)),
+            disk_dir=os.getenv('ARTIFACT_CACHE_DIR') or None
+        )
+
+    def model_tag(self):
+        #Identify the loaded spaCy pipeline so a model upgrade invalidates cached analyses
+        if not self.nlp:
+            return 'no-model'
+        meta = self.nlp.meta
+        return f"{meta.get('lang')}_{meta.get('name')}-{meta.get('version')}/spacy-{spacy.__version__}"
     
     def clean_text(self, text):
         #Remove special characters and digits. Clean and normalize text
@@ -41,15 +85,23 @@ class JobDescriptionProcessor:
         text = re.sub(r'<[^>]+>','',text)
         text = re.sub(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', '', text)
         text = re.sub(r'\S+@\S+', '', text)
-        text = re.sub(r'\s+', ' ', text).replace('\n', '. ')
+        text = collapse_whitespace(text)
 
 
         return text
     
-    def extract_sentences(self, text):
+    def parse(self, text):
+        #Run the spaCy pipeline; concurrent parses are bounded by the 'spacy' admission gate
+        return self.nlp(text)
+
+    def parse_many(self, texts):
+        #Batch several texts through the spaCy pipeline in one call
+        return list(self.nlp.pipe(texts))
+
+    def extract_sentences(self, text, doc = None):
         #Extract clean sentences from text
         if self.nlp:
-            doc = self.nlp(text)
+            doc = doc if doc is not None else self.parse(text)
             return [sent.text.strip() for sent in doc.sents if len(sent.text.strip()) > 1]
         else:
             try:
@@ -59,14 +111,11 @@ class JobDescriptionProcessor:
 
     
     def tokenize_and_filter(self, text):
-        #Tokenize text and filter out stopwords
-        try:
-            tokens = word_tokenize(text.lower())
-        except:
-            tokens = text.lower().split()
+        #Tokenize text and filter out stopwords, using the same tokens as the match scorers
+        doc = normalize_document(text)
         
         filtered_tokens = [
-            token for token in tokens
+            token for token in doc.tokens
             if token.isalnum() and len(token) > 2 and token not in self.stop_words
         ]
 
@@ -102,15 +151,15 @@ class JobDescriptionProcessor:
         return requirements
     
     def get_word_frequency(self, tokens, top_n = 20):
-        #Get most frequency words
-        word_freq = Counter(tokens)
-        return word_freq.most_common(top_n)
+        #Get most frequency words from tokens or a token Counter; ties broken alphabetically
+        word_freq = tokens if isinstance(tokens, Counter) else Counter(tokens)
+        return sorted(word_freq.items(), key = lambda kv: (-kv[1], kv[0]))[:top_n]
     
-    def extract_entities(self, text):
+    def extract_entities(self, text, doc = None):
         if not self.nlp:
             return []
 
-        doc = self.nlp(text)
+        doc = doc if doc is not None else self.parse(text)
         entities = []
 
         # spaCy base entities
@@ -153,38 +202,166 @@ class JobDescriptionProcessor:
         return list(unique_entities)
 
     
-    def process_job_description(self, job_text):
-        #Process job description
-        try:
-            cleaned_text = self.clean_text(job_text)
+    def split_segments(self, job_text):
+        #Split the raw posting into lines, bullets and sentences, before cleaning collapses the line breaks
+        return [seg.strip() for seg in _SEGMENT_SPLIT.split(job_text or '') if seg and seg.strip()]
+
+    def segment_counts(self, segment):
+        #Cheap per-segment counts; a posting's totals are the sum over its segments
+        cleaned = self.clean_text(segment)
+        doc = NormalizedDocument(cleaned)
+        tokens = self.tokenize_and_filter(doc)
+        return {
+            'cleaned': cleaned,
+            'tokens': tokens,
+            'token_counts': Counter(tokens),
+            'keyword_counts': keyword_terms(doc),
+            'skill_counts': Counter({skill for skills in self.extract_skills(segment).values() for skill in skills})
+        }
+
+    def analyze_segments(self, segments, segment_ids):
+        #Per-segment analyses; segments missing from the cache go through spaCy together in one batch
+        analyses = {sid: self._segment_cache.get(sid) for sid in segment_ids}
+        missing = {sid: seg for sid, seg in zip(segment_ids, segments) if analyses[sid] is None}
+        if missing:
+            fresh = {sid: self.segment_counts(seg) for sid, seg in missing.items()}
+            cleaned = [analysis['cleaned'] for analysis in fresh.values()]
+            with admission.slot('spacy'):
+                docs = self.parse_many(cleaned) if self.nlp else [None] * len(cleaned)
+            for (sid, analysis), doc in zip(fresh.items(), docs):
+                analysis['sentences'] = self.extract_sentences(analysis['cleaned'], doc)
+                analysis['entities'] = self.extract_entities(analysis['cleaned'], doc)
+                self._segment_cache.set(sid, analysis)
+                analyses[sid] = analysis
+        return [analyses[sid] for sid in segment_ids], len(missing)
 
-            sentences = self.extract_sentences(cleaned_text)
+    def sum_counts(self, analyses):
+        totals = {name: Counter() for name in COUNT_FIELDS}
+        for analysis in analyses:
+            for name in COUNT_FIELDS:
+                totals[name].update(analysis[name])
+        return totals
 
-            tokens = self.tokenize_and_filter(cleaned_text)
+    def update_counts(self, totals, removed, added):
+        #Adjust a previous version's totals by the segments that left and joined the posting
+        updated = {name: Counter(totals[name]) for name in COUNT_FIELDS}
+        for analysis in removed:
+            for name in COUNT_FIELDS:
+                updated[name].subtract(analysis[name])
+        for analysis in added:
+            for name in COUNT_FIELDS:
+                updated[name].update(analysis[name])
+        return {name: +counts for name, counts in updated.items()}
 
-            skills = self.extract_skills(job_text)
+    def build_job_data(self, job_text, cleaned_text, sentences, tokens, entities, totals):
+        #Assemble the job record; skills, keywords and top words come from the summed segment counts
+        skills = {
+            category: [skill for skill in names if totals['skill_counts'][skill] > 0]
+            for category, names in self.tech_skills.items()
+        }
+        keywords = top_keywords(totals['keyword_counts'])
+        return {
+            # Covers everything the match scorers read, so a cached (resume_id, job_id) score is never stale;
+            # hashed over normalized text so whitespace-only edits keep the id
+            'job_id': content_id(json.dumps([normalize_text(job_text), skills, keywords], sort_keys = True)),
+            'original_text': job_text,
+            'cleaned_text': cleaned_text,
+            'word_count': len(job_text.split()),
+            'sentence_count': len(sentences),
+            'sentences': sentences[:5],
+            'tokens': tokens[:50],
+            'skills': skills,
+            'requirements': self.extract_requirements(job_text),
+            'top_words': self.get_word_frequency(totals['token_counts']),
+            'keywords': keywords,
+            'entities': entities[:10]
+        }
 
-            requirements = self.extract_requirements(job_text)
+    def process_job_description_incremental(self, job_text, job_key):
+        #Re-analyze an edited posting, re-parsing only segments that changed since its last version
+        try:
+            segments = self.split_segments(job_text)
+            segment_ids = [content_id(seg) for seg in segments]
+            analyses, reparsed = self.analyze_segments(segments, segment_ids)
+            current = dict(zip(segment_ids, analyses))
 
-            word_freq = self.get_word_frequency(tokens)
+            previous = self._job_versions.get(job_key)
+            if previous is None:
+                totals = self.sum_counts(analyses)
+                changed = len(segment_ids)
+            else:
+                old, new = Counter(previous['segment_ids']), Counter(segment_ids)
+                added = [current[sid] for sid in (new - old).elements()]
+                removed = [previous['analyses'][sid] for sid in (old - new).elements()]
+                totals = self.update_counts(previous['totals'], removed, added)
+                changed = len(added)
+            self._job_versions.set(job_key, {'segment_ids': segment_ids, 'analyses': current, 'totals': totals})
 
-            entities = self.extract_entities(cleaned_text)
+            entities = {}
+            for analysis in analyses:
+                for e in analysis['entities']:
+                    entities.setdefault(f"{e['text']}_{e['label']}", e)
 
+            data = self.build_job_data(
+                job_text,
+                self.clean_text(job_text),
+                [sentence for analysis in analyses for sentence in analysis['sentences']],
+                [token for analysis in analyses for token in analysis['tokens']],
+                list(entities.values()),
+                totals
+            )
+            data['job_key'] = job_key
+            data['incremental'] = {
+                'segments': len(segments),
+                'reparsed_segments': reparsed,
+                'changed_segments': changed
+            }
             return {
                 'success': True,
-                'data': {
-                    'original_text': job_text,
-                    'cleaned_text': cleaned_text,
-                    'word_count': len(job_text.split()),
-                    'sentence_count': len(sentences),
-                    'sentences': sentences[:5],
-                    'tokens': tokens[:50],
-                    'skills': skills,
-                    'requirements': requirements,
-                    'top_words': word_freq,
-                    'entities': entities[:10]
-                }
+                'data': data
+            }
+        except Overloaded:
+            raise
+        except Exception as e:
+            return {
+                'success': False,
+                'error': str(e)
+            }
+
+    def process_job_description(self, job_text, job_key = None):
+        #Process job description
+        if job_key:
+            return self.process_job_description_incremental(job_text, job_key)
+        try:
+            cache_key = content_hash(job_text)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return dict(cached, cached = True)
+
+            cleaned_text = self.clean_text(job_text)
+            parts = [self.segment_counts(seg) for seg in self.split_segments(job_text)]
+
+            # One parse of the whole posting keeps sentence and entity context across segments
+            with admission.slot('spacy'):
+                doc = self.parse(cleaned_text) if self.nlp else None
+                sentences = self.extract_sentences(cleaned_text, doc)
+            entities = self.extract_entities(cleaned_text, doc)
+
+            result = {
+                'success': True,
+                'data': self.build_job_data(
+                    job_text,
+                    cleaned_text,
+                    sentences,
+                    [token for part in parts for token in part['tokens']],
+                    entities,
+                    self.sum_counts(parts)
+                )
             }
+            self.cache.set(cache_key, result)
+            return dict(result, cached = False)
+        except Overloaded:
+            raise
         except Exception as e:
             return {
                 'success': False,
@@ -0,0 +1,20 @@
+# Keyword term counting shared by the job processor and match engine
+import numpy as np
+from collections import Counter
+from typing import List, Tuple
+from app.utils.normalized_text import normalize_document
+
+
+def keyword_terms(text_or_doc) -> Counter:
+    """Count unigram/bigram keyword terms the way the match engine's TF-IDF does"""
+    return normalize_document(text_or_doc).term_counts
+
+
+def top_keywords(term_counts: Counter, top_n: int = 20) -> List[Tuple[str, float]]:
+    """Single-document TF-IDF weights (l2-normalised term frequency) of the top terms"""
+    if not term_counts:
+        return []
+    norm = float(np.sqrt(sum(c * c for c in term_counts.values())))
+    # Ties broken alphabetically-descending to mirror argsort()[::-1] over sorted features
+    ranked = sorted(term_counts.items(), key=lambda kv: (kv[1], kv[0]), reverse=True)[:top_n]
+    return [(term, count / norm) for term, count in ranked]
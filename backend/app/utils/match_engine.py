@@ -1,10 +1,19 @@
 import os
 import numpy as np
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Tuple, Any, Iterable, Iterator
 import logging
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 import re
+import time
+import threading
+from contextlib import nullcontext
+from sklearn.base import clone
+from app.utils.text_hash import content_id
+from app.utils.lru import LRUCache
+from app.utils.normalized_text import NormalizedDocument, normalize_document, normalize_text, document_terms
+from app.utils.admission import admission, Overloaded
+from app.utils.requirement_coverage import split_requirements, split_sentences, lexical_vectors
 
 # import AI libraries
 try:
@@ -21,18 +30,67 @@ except ImportError:
     OPENAI_AVAILABLE = False
     print("OpenAI not available")
 
+# Scorers in increasing cost order; under a latency budget the later ones are skipped first
+SCORER_ORDER = ['skill_match', 'keyword_coverage', 'tfidf_similarity', 'embedding_similarity']
+
+SCORER_WEIGHTS = {
+    'tfidf_similarity': 0.25,
+    'embedding_similarity': 0.35,
+    'skill_match': 0.25,
+    'keyword_coverage': 0.15
+}
+
+# Initial per-call cost estimates (ms), refined from observed timings
+DEFAULT_SCORER_COSTS = {
+    'skill_match': 0.1,
+    'keyword_coverage': 5.0,
+    'tfidf_similarity': 5.0,
+    'embedding_similarity': 150.0
+}
+
+# Minimum requirement-to-sentence similarity (0-100) counted as evidence, per vector type
+REQUIREMENT_THRESHOLDS = {
+    'embedding': 50.0,
+    'lexical': 20.0
+}
+
+def _rounded(score):
+    return round(score, 2) if score is not None else None
+
 class AIMatchEngine:
     def __init__(self):
         self.use_sentence_transformers = os.getenv('USE_SENTENCE_TRANSFORMERS', 'true').lower() == 'true'
         self.openai_api_key = os.getenv('OPENAI_API_KEY')
         
+        # Scores for (resume_id, job_id) pairs; IDs change whenever a document's representation does
+        self._match_cache = LRUCache(int(os.getenv('MATCH_CACHE_SIZE', 10000)))
+        
+        # Embedding vectors keyed by content hash of the normalized text
+        self._embedding_cache = LRUCache(int(os.getenv('EMBEDDING_CACHE_SIZE', 2048)))
+        
+        # Per-request latency budget; unset means every scorer always runs
+        budget = os.getenv('MATCH_LATENCY_BUDGET_MS')
+        self.latency_budget_ms = float(budget) if budget else None
+        self._scorer_costs = dict(DEFAULT_SCORER_COSTS)
+        self._costs_lock = threading.Lock()
+        
+        # Request-level parallelism: at most this many matches compute at once (0 = unbounded)
+        concurrency = int(os.getenv('MATCH_CONCURRENCY', 0))
+        self._compute_slots = threading.BoundedSemaphore(concurrency) if concurrency > 0 else None
+        
+        # Normalized documents keyed by content hash, so a job scored against many resumes is normalized once
+        self._document_cache = LRUCache(int(os.getenv('DOCUMENT_CACHE_SIZE', 256)))
+        
+        # Normalized requirement vectors per (requirement list, vector type), reused for every candidate
+        self._requirement_cache = LRUCache(int(os.getenv('REQUIREMENT_CACHE_SIZE', 256)))
+        
         # Initialize models
         self.sentence_model = None
+        # Terms (stop-word filtered unigrams + bigrams) come precomputed from NormalizedDocument.
+        # This is an unfitted template; each call fits its own clone so concurrent requests never share state
         self.tfidf_vectorizer = TfidfVectorizer(
-            stop_words='english',
-            max_features=5000,
-            ngram_range=(1, 2),
-            lowercase=True
+            analyzer=document_terms,
+            max_features=5000
         )
 
         if SENTENCE_TRANSFORMERS_AVAILABLE and self.use_sentence_transformers:
@@ -49,18 +107,19 @@ class AIMatchEngine:
             print("OpenAI API configured")
     def preprocess_text(self, text: str) -> str:
         """Clean and preprocess text for matching"""
-        if not text:
-            return ""
-        
-        text = text.lower()
-       
-        text = ' '.join(text.split())
-        
-        text = re.sub(r'[^\w\s@.-]', ' ', text)
-       
-        text = re.sub(r'\s+', ' ', text).strip()
+        return normalize_text(text)
+    
+    def get_document(self, text) -> NormalizedDocument:
+        """Normalize a document once, reusing recent results for repeated texts"""
+        if isinstance(text, NormalizedDocument):
+            return text
         
-        return text
+        key = content_id(text)
+        doc = self._document_cache.get(key)
+        if doc is None:
+            doc = normalize_document(text)
+            self._document_cache.set(key, doc)
+        return doc
     
     def extract_key_sections(self, resume_text: str, job_text: str) -> Dict[str, str]:
         """Extract key sections from resume and job description"""
@@ -113,12 +172,12 @@ class AIMatchEngine:
         
         return {'resume': resume_sections, 'job': job_sections}
     
-    def get_embeddings_sentence_transformer(self, texts: List[str]) -> np.ndarray:
+    def get_embeddings_sentence_transformer(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
         """Get embeddings using Sentence Transformers"""
         if not self.sentence_model:
             raise ValueError("Sentence Transformer model not available")
         
-        embeddings = self.sentence_model.encode(texts, convert_to_tensor=False)
+        embeddings = self.sentence_model.encode(texts, batch_size=batch_size, convert_to_tensor=False)
         return np.array(embeddings)
     
     def get_embeddings_openai(self, texts: List[str]) -> np.ndarray:
@@ -140,15 +199,15 @@ class AIMatchEngine:
         
         return np.array(embeddings)
     
-    def get_tfidf_similarity(self, resume_text: str, job_text: str) -> float:
+    def get_tfidf_similarity(self, resume_text, job_text) -> float:
         """Calculate TF-IDF cosine similarity"""
         try:
             documents = [
-                self.preprocess_text(resume_text),
-                self.preprocess_text(job_text)
+                self.get_document(resume_text),
+                self.get_document(job_text)
             ]
             
-            tfidf_matrix = self.tfidf_vectorizer.fit_transform(documents)
+            tfidf_matrix = clone(self.tfidf_vectorizer).fit_transform(documents)
             similarity_matrix = cosine_similarity(tfidf_matrix)
             
             return float(similarity_matrix[0][1])
@@ -156,28 +215,156 @@ class AIMatchEngine:
             print(f"TF-IDF similarity error: {e}")
             return 0.0
 
-    def get_embedding_similarity(self, resume_text: str, job_text: str) -> float:
+    def embeddings_available(self) -> bool:
+        return self.sentence_model is not None or (OPENAI_AVAILABLE and bool(self.openai_api_key))
+    
+    def has_cached_embeddings(self, texts: List[str]) -> bool:
+        return all(content_id(text) in self._embedding_cache for text in texts)
+    
+    def get_embeddings(self, texts: List[str]) -> np.ndarray:
+        """Embed texts, computing only those not already in the embedding cache"""
+        keys = [content_id(text) for text in texts]
+        embeddings = [self._embedding_cache.get(key) for key in keys]
+        missing = [i for i, vector in enumerate(embeddings) if vector is None]
+        
+        if missing:
+            missing_texts = [texts[i] for i in missing]
+            with admission.slot('embeddings'):
+                if self.sentence_model:
+                    vectors = self.get_embeddings_sentence_transformer(missing_texts)
+                else:
+                    vectors = self.get_embeddings_openai(missing_texts)
+            for i, vector in zip(missing, vectors):
+                self._embedding_cache.set(keys[i], vector)
+                embeddings[i] = vector
+        
+        return np.array(embeddings)
+    
+    def preload_embeddings(self, texts: List[str], vectors) -> None:
+        """Seed the embedding cache with vectors computed elsewhere (views are stored, not copied)"""
+        for text, vector in zip(texts, vectors):
+            self._embedding_cache.set(content_id(self.get_document(text).text), vector)
+    
+    def get_embedding_similarity(self, resume_text, job_text) -> float:
         """calculate embedding-based cosine similarity"""
         try:
             texts = [
-                self.preprocess_text(resume_text),
-                self.preprocess_text(job_text)
+                self.get_document(resume_text).text,
+                self.get_document(job_text).text
             ]
 
-            if self.sentence_model:
-                embeddings = self.get_embeddings_sentence_transformer(texts)
-            elif OPENAI_AVAILABLE and self.openai_api_key:
-                embeddings = self.get_embeddings_openai(texts)
-            else:
+            # Precomputed vectors (e.g. loaded by the batch scorer) work even without a model
+            if not self.embeddings_available() and not self.has_cached_embeddings(texts):
                 return 0.0
+            embeddings = self.get_embeddings(texts)
             
             similarity = cosine_similarity([embeddings[0]],[embeddings[1]]) [0][0]
             return float(similarity)
         
+        except Overloaded:
+            raise
         except Exception as e:
             print(f"Embedding similarity error: {e}")
             return 0.0
 
+    def _requirement_vectors(self, requirements: List[str], sentences: List[str]):
+        """Unit-length requirement and sentence vectors; requirement rows come from the per-job cache when present"""
+        # Keyed by the requirement list itself: postings with the same job_id can still split into different bullets
+        requirements_key = content_id('\n'.join(requirements))
+        if self.embeddings_available():
+            cached = self._requirement_cache.get((requirements_key, 'embedding'))
+            try:
+                if cached is not None:
+                    vectors = self.get_embeddings(sentences) if sentences else np.zeros((0, cached.shape[1]))
+                    requirement_vectors = cached
+                else:
+                    # One batch for requirements and sentences together
+                    vectors = self.get_embeddings(requirements + sentences)
+                    requirement_vectors, vectors = vectors[:len(requirements)], vectors[len(requirements):]
+                    norms = np.linalg.norm(requirement_vectors, axis=1, keepdims=True)
+                    requirement_vectors = requirement_vectors / np.where(norms == 0, 1, norms)
+                    self._requirement_cache.set((requirements_key, 'embedding'), requirement_vectors)
+                norms = np.linalg.norm(vectors, axis=1, keepdims=True) if len(vectors) else 1
+                return 'embedding', requirement_vectors, vectors / np.where(norms == 0, 1, norms), cached is not None, False
+            except Overloaded:
+                # Saturated embedding stage: answer from term overlap instead of failing
+                degraded = True
+        else:
+            degraded = False
+        
+        cached = self._requirement_cache.get((requirements_key, 'lexical'))
+        requirement_vectors = cached if cached is not None else lexical_vectors(requirements)
+        if cached is None:
+            self._requirement_cache.set((requirements_key, 'lexical'), requirement_vectors)
+        sentence_vectors = lexical_vectors(sentences) if sentences else None
+        return 'lexical', requirement_vectors, sentence_vectors, cached is not None, degraded
+    
+    def calculate_requirement_coverage(self, resume_data: Dict, job_data: Dict, threshold: float = None) -> Dict[str, Any]:
+        """Best resume sentence for each job requirement, from one requirement x sentence similarity matrix"""
+        try:
+            resume_text = resume_data.get('data', {}).get('raw_text', '')
+            job = job_data.get('data', {})
+            job_text = job.get('original_text', '')
+            
+            if not resume_text or not job_text:
+                return {
+                    'success': False,
+                    'error': 'Missing resume or job description text'
+                }
+            
+            requirements = split_requirements(job.get('requirements', []))
+            sentences = split_sentences(resume_text)
+            job_id = job.get('job_id') or content_id(job_text)
+            
+            results = []
+            method, cached, degraded = None, False, False
+            if requirements:
+                method, requirement_vectors, sentence_vectors, cached, degraded = self._requirement_vectors(
+                    requirements, sentences
+                )
+                if sentences:
+                    similarity = requirement_vectors @ sentence_vectors.T
+                    if hasattr(similarity, 'toarray'):
+                        similarity = similarity.toarray()
+                    best = similarity.argmax(axis=1)
+                    best_scores = similarity[np.arange(len(requirements)), best]
+                else:
+                    best = np.zeros(len(requirements), dtype=int)
+                    best_scores = np.zeros(len(requirements))
+                
+                threshold = REQUIREMENT_THRESHOLDS[method] if threshold is None else threshold
+                for i, requirement in enumerate(requirements):
+                    score = float(best_scores[i]) * 100
+                    results.append({
+                        'requirement': requirement,
+                        'score': round(score, 2),
+                        'satisfied': score >= threshold,
+                        'evidence': sentences[best[i]] if sentences and score > 0 else None
+                    })
+            
+            satisfied = sum(1 for r in results if r['satisfied'])
+            return {
+                'success': True,
+                'data': {
+                    'resume_id': resume_data.get('data', {}).get('resume_id') or content_id(resume_text),
+                    'job_id': job_id,
+                    'method': method,
+                    'threshold': threshold,
+                    'requirement_count': len(results),
+                    'satisfied_count': satisfied,
+                    'coverage_percentage': round(satisfied / len(results) * 100, 2) if results else None,
+                    'requirements': results,
+                    'cached_requirements': cached,
+                    'degraded': degraded
+                }
+            }
+        
+        except Exception as e:
+            return {
+                'success': False,
+                'error': f'Requirement coverage failed: {str(e)}'
+            }
+
     def extract_skills_match(self, resume_skills: Dict, job_skills: Dict) -> Dict[str, Any]:
         """Analyze skill matching between resume and job"""
         
@@ -208,21 +395,25 @@ class AIMatchEngine:
             'total_resume_skills': len(resume_skill_list)
         }
     
-    def analyze_keyword_density(self, resume_text: str, job_text: str) -> Dict[str, Any]:
+    def analyze_keyword_density(self, resume_text, job_text, job_keywords: List = None) -> Dict[str, Any]:
         """Analyze keyword density and important terms"""
        
-        job_clean = self.preprocess_text(job_text)
-        resume_clean = self.preprocess_text(resume_text)
+        resume_clean = self.get_document(resume_text).text
         
         try:
             
-            job_tfidf = self.tfidf_vectorizer.fit_transform([job_clean])
-            feature_names = self.tfidf_vectorizer.get_feature_names_out()
-            
-            job_scores = job_tfidf.toarray()[0]
-            top_indices = job_scores.argsort()[-20:][::-1] 
-            
-            job_keywords = [(feature_names[i], job_scores[i]) for i in top_indices if job_scores[i] > 0]
+            if job_keywords is None:
+                vectorizer = clone(self.tfidf_vectorizer)
+                job_tfidf = vectorizer.fit_transform([self.get_document(job_text)])
+                feature_names = vectorizer.get_feature_names_out()
+                
+                job_scores = job_tfidf.toarray()[0]
+                top_indices = job_scores.argsort()[-20:][::-1] 
+                
+                job_keywords = [(feature_names[i], job_scores[i]) for i in top_indices if job_scores[i] > 0]
+            else:
+                # Precomputed (possibly incrementally) by JobDescriptionProcessor
+                job_keywords = [tuple(k) for k in job_keywords]
             
             keyword_matches = []
             for keyword, score in job_keywords:
@@ -259,12 +450,16 @@ class AIMatchEngine:
             }
     
     def generate_match_insights(self, match_result: Dict[str, Any]) -> List[str]:
-        """Generate human-readable insights about the match"""
+        """Generate human-readable insights about the match, only from scorers that actually ran"""
         insights = []
         
         overall_score = match_result.get('overall_score', 0)
         skill_analysis = match_result.get('skill_analysis', {})
         keyword_analysis = match_result.get('keyword_analysis', {})
+        scores = match_result.get('scores')
+        
+        def ran(name):
+            return scores is None or name in scores
         
         if overall_score >= 80:
             insights.append("🟢 Excellent match! This candidate shows strong alignment with the job requirements.")
@@ -279,30 +474,40 @@ class AIMatchEngine:
         matched_skills = skill_analysis.get('matched_skills', [])
         missing_skills = skill_analysis.get('missing_skills', [])
         
-        if skill_match_pct >= 70:
+        if not ran('skill_match'):
+            pass
+        elif skill_match_pct >= 70:
             insights.append(f"✅ Strong technical fit with {len(matched_skills)} relevant skills matched.")
         elif skill_match_pct >= 40:
             insights.append(f"⚠️ Partial technical fit. Has {len(matched_skills)} required skills but missing {len(missing_skills)} key skills.")
         else:
             insights.append(f"❌ Limited technical match. Missing {len(missing_skills)} critical skills.")
         
+        # A skipped keyword scorer leaves placeholder zeros that say nothing about the resume
         keyword_coverage = keyword_analysis.get('keyword_coverage_percentage', 0)
-        if keyword_coverage >= 70:
+        if not ran('keyword_coverage'):
+            pass
+        elif keyword_coverage >= 70:
             insights.append("📝 Resume language closely matches job requirements.")
         elif keyword_coverage >= 40:
             insights.append("📝 Some alignment in resume language, but could be improved.")
         else:
             insights.append("📝 Resume language needs optimization for this role.")
        
-        if missing_skills:
+        if missing_skills and ran('skill_match'):
             top_missing = missing_skills[:3]
             insights.append(f"🎯 Focus areas for improvement: {', '.join(top_missing)}")
         
         return insights
     
-    def calculate_comprehensive_match(self, resume_data: Dict, job_data: Dict) -> Dict[str, Any]:
-        """Calculate comprehensive match score with detailed analysis"""
-        
+    def calculate_comprehensive_match(self, resume_data: Dict, job_data: Dict, budget_ms: float = None) -> Dict[str, Any]:
+        """Calculate comprehensive match score with detailed analysis.
+
+        With a latency budget (argument or MATCH_LATENCY_BUDGET_MS), scorers run
+        in cost order and any whose estimated cost would overrun the deadline
+        are skipped; the result is then marked as degraded.
+        """
+        start = time.perf_counter()
         try:
             
             resume_text = resume_data.get('data', {}).get('raw_text', '')
@@ -313,31 +518,50 @@ class AIMatchEngine:
                     'success': False,
                     'error': 'Missing resume or job description text'
                 }
-           
-            tfidf_score = self.get_tfidf_similarity(resume_text, job_text)
-            embedding_score = self.get_embedding_similarity(resume_text, job_text)
             
+            cache_key = self._match_cache_key(resume_data, job_data)
+            cached = self._match_cache.get(cache_key) if cache_key else None
+            if cached is not None:
+                return cached
+           
+            budget_ms = self.latency_budget_ms if budget_ms is None else budget_ms
+            deadline = start + budget_ms / 1000 if budget_ms else None
+           
+            # Normalize each document once; every scorer below reads the same artifact
+            resume_doc = self.get_document(resume_text)
+            job_doc = self.get_document(job_text)
+           
             resume_skills = job_data.get('data', {}).get('skills', {}) 
             job_skills = job_data.get('data', {}).get('skills', {})
             skill_analysis = self.extract_skills_match(resume_skills, job_skills)
-            
-           
-            keyword_analysis = self.analyze_keyword_density(resume_text, job_text)
-           
-            scores = {
-                'tfidf_similarity': tfidf_score * 100,  
-                'embedding_similarity': embedding_score * 100,
-                'skill_match': skill_analysis.get('skill_match_percentage', 0),
-                'keyword_coverage': keyword_analysis.get('keyword_coverage_percentage', 0)
+            keyword_analysis = {
+                'job_keywords': [],
+                'keyword_matches': [],
+                'keyword_coverage_percentage': 0,
+                'total_important_keywords': 0
             }
             
-            weights = {
-                'tfidf_similarity': 0.25,
-                'embedding_similarity': 0.35,
-                'skill_match': 0.25,
-                'keyword_coverage': 0.15
+            def run_keyword_coverage():
+                nonlocal keyword_analysis
+                keyword_analysis = self.analyze_keyword_density(
+                    resume_doc, job_doc, job_data.get('data', {}).get('keywords')
+                )
+                return keyword_analysis.get('keyword_coverage_percentage', 0)
+            
+            scorers = {
+                'skill_match': lambda: skill_analysis.get('skill_match_percentage', 0),
+                'keyword_coverage': run_keyword_coverage,
+                'tfidf_similarity': lambda: self.get_tfidf_similarity(resume_doc, job_doc) * 100,
+                'embedding_similarity': lambda: self.get_embedding_similarity(resume_doc, job_doc) * 100
             }
             
+            # Time spent waiting for a compute slot counts against the deadline
+            with self._compute_slots or nullcontext():
+                scores, skipped = self._run_scorers(scorers, [resume_doc.text, job_doc.text], deadline)
+            
+            # Re-normalize over the scorers that actually ran
+            total_weight = sum(SCORER_WEIGHTS[key] for key in scores)
+            weights = {key: SCORER_WEIGHTS[key] / total_weight for key in scores}
             overall_score = sum(scores[key] * weights[key] for key in scores.keys())
            
             match_result = {
@@ -349,17 +573,21 @@ class AIMatchEngine:
             
             insights = self.generate_match_insights(match_result)
             
-            return {
+            result = {
                 'success': True,
                 'data': {
+                    'resume_id': resume_data.get('data', {}).get('resume_id') or content_id(resume_text),
+                    'job_id': job_data.get('data', {}).get('job_id') or content_id(job_text),
                     'overall_score': round(overall_score, 2),
                     'confidence_level': 'High' if overall_score >= 60 else 'Medium' if overall_score >= 40 else 'Low',
                     'scores': {
-                        'tfidf_similarity': round(scores['tfidf_similarity'], 2),
-                        'ai_similarity': round(scores['embedding_similarity'], 2),
-                        'skill_match': round(scores['skill_match'], 2),
-                        'keyword_coverage': round(scores['keyword_coverage'], 2)
+                        'tfidf_similarity': _rounded(scores.get('tfidf_similarity')),
+                        'ai_similarity': _rounded(scores.get('embedding_similarity')),
+                        'skill_match': _rounded(scores.get('skill_match')),
+                        'keyword_coverage': _rounded(scores.get('keyword_coverage'))
                     },
+                    'degraded': bool(skipped),
+                    'skipped_scorers': skipped,
                     'skill_analysis': skill_analysis,
                     'keyword_analysis': keyword_analysis,
                     'insights': insights,
@@ -367,12 +595,75 @@ class AIMatchEngine:
                 }
             }
             
+            # Degraded results are never cached so a later, unhurried request gets the full score
+            if cache_key and not skipped:
+                self._match_cache.set(cache_key, result)
+            
+            return result
+            
         except Exception as e:
             return {
                 'success': False,
                 'error': f'Match calculation failed: {str(e)}'
             }
     
+    def _run_scorers(self, scorers: Dict[str, Any], texts: List[str], deadline: float = None) -> Tuple[Dict[str, float], List[str]]:
+        """Run scorers cheapest first, skipping those whose estimated cost would miss the deadline or find their stage saturated"""
+        scores = {}
+        skipped = []
+        for name in SCORER_ORDER:
+            cached_vectors = name == 'embedding_similarity' and self.has_cached_embeddings(texts)
+            
+            # The cheapest scorer always runs so every result has at least one score
+            if deadline is not None and scores:
+                estimate = 0.0 if cached_vectors else self._scorer_costs[name]
+                if time.perf_counter() + estimate / 1000 > deadline:
+                    skipped.append(name)
+                    if not cached_vectors:
+                        # Relax toward the default so one slow call cannot exclude the scorer for good
+                        with self._costs_lock:
+                            self._scorer_costs[name] = 0.8 * self._scorer_costs[name] + 0.2 * DEFAULT_SCORER_COSTS[name]
+                    continue
+            
+            started = time.perf_counter()
+            try:
+                scores[name] = scorers[name]()
+            except Overloaded:
+                # A saturated model stage degrades the match instead of failing it
+                skipped.append(name)
+                continue
+            if not cached_vectors:
+                elapsed = (time.perf_counter() - started) * 1000
+                with self._costs_lock:
+                    self._scorer_costs[name] = 0.8 * self._scorer_costs[name] + 0.2 * elapsed
+        return scores, skipped
+    
+    def _match_cache_key(self, resume_data: Dict, job_data: Dict):
+        """Cache key for parsed documents; ad-hoc text without IDs is never cached"""
+        resume_id = resume_data.get('data', {}).get('resume_id')
+        job_id = job_data.get('data', {}).get('job_id')
+        if not resume_id or not job_id:
+            return None
+        return (resume_id, job_id)
+    
+    def iter_matches(self, resumes: Iterable[Dict], job_data: Dict) -> Iterator[Dict[str, Any]]:
+        """Lazily score each resume against one job, yielding compact results as they are computed"""
+        for resume_data in resumes:
+            match_result = self.calculate_comprehensive_match(resume_data, job_data)
+            candidate_id = resume_data.get('data', {}).get('candidate_id')
+            if not match_result['success']:
+                yield {'candidate_id': candidate_id, 'error': match_result['error']}
+                continue
+            data = match_result['data']
+            yield {
+                'candidate_id': candidate_id,
+                'resume_id': data['resume_id'],
+                'job_id': data['job_id'],
+                'overall_score': data['overall_score'],
+                'scores': data['scores'],
+                'recommendation': data['recommendation']
+            }
+    
     def _get_recommendation(self, score: float) -> str:
         """Get hiring recommendation based on score"""
         if score >= 80:
@@ -0,0 +1,91 @@
+# Normalize each document once and share the result across scorers and extractors
+import re
+from array import array
+from collections import Counter
+from typing import List, Tuple
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+
+# Characters dropped by every scorer (same rule as AIMatchEngine.preprocess_text)
+_STRIP_PATTERN = re.compile(r'[^\w\s@.-]+')
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+# sklearn's default token_pattern, so TF-IDF terms match TfidfVectorizer exactly
+_TOKEN_PATTERN = re.compile(r'(?u)\b\w\w+\b')
+
+
+def collapse_whitespace(text: str) -> str:
+    return _WHITESPACE_PATTERN.sub(' ', text).strip()
+
+
+def strip_punctuation(text: str) -> str:
+    """Drop punctuation other than @ . - and collapse whitespace, preserving case"""
+    if not text:
+        return ""
+    return collapse_whitespace(_STRIP_PATTERN.sub(' ', text))
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase, drop punctuation other than @ . - and collapse whitespace"""
+    if not text:
+        return ""
+    return strip_punctuation(text.lower())
+
+
+class NormalizedDocument:
+    """Lowercased text, tokens, token offsets and n-grams for one document.
+
+    Built once per document; the TF-IDF, embedding and keyword scorers all read
+    from it instead of re-running preprocess_text on the raw string.
+    """
+    __slots__ = ('text', 'tokens', '_offsets', '_terms', '_term_counts')
+
+    def __init__(self, text: str):
+        self.text = normalize_text(text)
+        self.tokens = _TOKEN_PATTERN.findall(self.text)
+        self._offsets = None
+        self._terms = None
+        self._term_counts = None
+
+    def __len__(self):
+        return len(self.tokens)
+
+    def ngrams(self, n: int, tokens: List[str] = None) -> List[str]:
+        tokens = self.tokens if tokens is None else tokens
+        return [' '.join(tokens[i:i + n]) for i in range(len(tokens) - n + 1)]
+
+    @property
+    def offsets(self) -> array:
+        """Start offset of each token in the normalized text (computed on first use)"""
+        if self._offsets is None:
+            self._offsets = array('I', (m.start() for m in _TOKEN_PATTERN.finditer(self.text)))
+        return self._offsets
+
+    @property
+    def terms(self) -> List[str]:
+        """Unigram and bigram terms with English stop words removed (TfidfVectorizer's analyzer)"""
+        if self._terms is None:
+            content = [t for t in self.tokens if t not in ENGLISH_STOP_WORDS]
+            self._terms = content + self.ngrams(2, content)
+        return self._terms
+
+    @property
+    def term_counts(self) -> Counter:
+        if self._term_counts is None:
+            self._term_counts = Counter(self.terms)
+        return self._term_counts
+
+    def span(self, index: int) -> Tuple[int, int]:
+        """Character span of a token within the normalized text"""
+        start = self.offsets[index]
+        return start, start + len(self.tokens[index])
+
+
+def document_terms(doc: NormalizedDocument) -> List[str]:
+    """Vectorizer analyzer over pre-normalized documents (module-level so it pickles)"""
+    return doc.terms
+
+
+def normalize_document(text_or_doc) -> NormalizedDocument:
+    """Accept raw text or an existing NormalizedDocument"""
+    if isinstance(text_or_doc, NormalizedDocument):
+        return text_or_doc
+    return NormalizedDocument(text_or_doc or "")
@@ -0,0 +1,366 @@
+# Pluggable PDF text extraction backends with per-page parallelism and hard limits
+import os
+import atexit
+import threading
+import multiprocessing
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:
+    RESOURCE_AVAILABLE = False
+
+try:
+    import pypdfium2 as pdfium
+    PDFIUM_AVAILABLE = True
+except ImportError:
+    PDFIUM_AVAILABLE = False
+
+# PDFium is not thread-safe; in-process calls from request threads take turns
+_pdfium_lock = threading.Lock()
+
+try:
+    import pdfplumber
+    PDFPLUMBER_AVAILABLE = True
+except ImportError:
+    PDFPLUMBER_AVAILABLE = False
+
+
+class PDFExtractor(ABC):
+    """Interface for a PDF text extraction backend"""
+    name = None
+
+    @classmethod
+    def available(cls) -> bool:
+        return True
+
+    @abstractmethod
+    def page_count(self, file_path: str) -> int:
+        ...
+
+    @abstractmethod
+    def extract_pages(self, file_path: str, page_numbers: List[int]) -> List[str]:
+        """Return the text of each requested (zero-based) page, in order"""
+
+
+class PdfminerExtractor(PDFExtractor):
+    name = 'pdfminer'
+
+    def page_count(self, file_path):
+        from pdfminer.pdfpage import PDFPage
+        with open(file_path, 'rb') as f:
+            return sum(1 for _ in PDFPage.get_pages(f))
+
+    def extract_pages(self, file_path, page_numbers):
+        from pdfminer.high_level import extract_text
+        # pdfminer ends every page with a form feed; one pass over the chunk, split back into pages
+        text = extract_text(file_path, page_numbers=page_numbers)
+        pages = text.split('\x0c')
+        return (pages + [''] * len(page_numbers))[:len(page_numbers)]
+
+
+class PdfiumExtractor(PDFExtractor):
+    name = 'pdfium'
+
+    @classmethod
+    def available(cls):
+        return PDFIUM_AVAILABLE
+
+    def page_count(self, file_path):
+        with _pdfium_lock:
+            pdf = pdfium.PdfDocument(file_path)
+            try:
+                return len(pdf)
+            finally:
+                pdf.close()
+
+    def extract_pages(self, file_path, page_numbers):
+        with _pdfium_lock:
+            pdf = pdfium.PdfDocument(file_path)
+            try:
+                texts = []
+                for n in page_numbers:
+                    page = pdf[n]
+                    textpage = page.get_textpage()
+                    texts.append(textpage.get_text_range())
+                    textpage.close()
+                    page.close()
+                return texts
+            finally:
+                pdf.close()
+
+
+class PdfplumberExtractor(PDFExtractor):
+    name = 'pdfplumber'
+
+    @classmethod
+    def available(cls):
+        return PDFPLUMBER_AVAILABLE
+
+    def page_count(self, file_path):
+        with pdfplumber.open(file_path) as pdf:
+            return len(pdf.pages)
+
+    def extract_pages(self, file_path, page_numbers):
+        with pdfplumber.open(file_path) as pdf:
+            return [pdf.pages[n].extract_text() or '' for n in page_numbers]
+
+
+EXTRACTORS = {
+    cls.name: cls for cls in (PdfminerExtractor, PdfiumExtractor, PdfplumberExtractor)
+}
+
+
+def get_extractor(name: str = None) -> PDFExtractor:
+    """Instantiate a backend by name; 'auto' picks the fastest one installed"""
+    name = (name or 'auto').lower()
+    if name == 'auto':
+        for candidate in ('pdfium', 'pdfminer'):
+            if EXTRACTORS[candidate].available():
+                return EXTRACTORS[candidate]()
+    if name not in EXTRACTORS:
+        raise ValueError(f"Unknown PDF backend '{name}'. Choose from: auto, {', '.join(EXTRACTORS)}")
+    if not EXTRACTORS[name].available():
+        raise ValueError(f"PDF backend '{name}' is not installed")
+    return EXTRACTORS[name]()
+
+
+# Upper bound on any out-of-process wait, used when no PDF_TIMEOUT is configured
+DEFAULT_TIMEOUT = 120
+
+
+def _address_space() -> int:
+    # Current virtual size of this process (Linux); 0 where /proc is unavailable
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[0]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        return 0
+
+
+def _limit_memory(memory_limit_mb):
+    # Runs once in each fresh worker: the budget is on top of what the interpreter already maps
+    if RESOURCE_AVAILABLE and memory_limit_mb:
+        limit = _address_space() + memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _page_count(backend, file_path):
+    return EXTRACTORS[backend]().page_count(file_path)
+
+
+def _extract_chunk(backend, file_path, page_numbers):
+    return EXTRACTORS[backend]().extract_pages(file_path, page_numbers)
+
+
+def _worker_context():
+    # Never fork the (threaded, model-laden) app process: workers start from a clean interpreter
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('forkserver')
+        # The default preload is __main__, which would build the whole app in the fork server
+        context.set_forkserver_preload(['app.utils.pdf_extractors'])
+        return context
+    return multiprocessing.get_context('spawn')
+
+
+class ExtractionCancelled(RuntimeError):
+    """Raised to requests whose queued or running extraction was dropped because the pool shut down"""
+
+
+def _worker_main(conn, memory_limit_mb):
+    # Runs one job at a time until the parent closes the pipe or kills the process
+    _limit_memory(memory_limit_mb)
+    while True:
+        try:
+            func, args = conn.recv()
+        except EOFError:
+            break
+        try:
+            conn.send(('ok', func(*args)))
+        except MemoryError:
+            conn.send(('memory', None))
+        except Exception as e:
+            conn.send(('error', f"{type(e).__name__}: {e}"))
+
+
+class _Worker:
+    def __init__(self, context, memory_limit_mb):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn, memory_limit_mb))
+        self.process.start()
+        child_conn.close()
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class WorkerPool:
+    """Fixed number of single-job worker processes.
+
+    Each job owns its worker for its whole run, so a job that overruns its
+    timeout is killed together with that one worker while other requests'
+    jobs keep running. Workers are started on demand and replaced lazily.
+    """
+
+    def __init__(self, size: int, memory_limit_mb: int = None):
+        self.size = size
+        self.memory_limit_mb = memory_limit_mb
+        self._context = _worker_context()
+        self._cond = threading.Condition()
+        self._idle: List[_Worker] = []
+        self._busy = set()
+        self._free = size
+        self._closed = False
+
+    def _acquire(self, wait_timeout: float) -> _Worker:
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._closed or self._free > 0, wait_timeout):
+                raise TimeoutError(f"No PDF worker became free within {wait_timeout}s")
+            if self._closed:
+                raise ExtractionCancelled("PDF extraction cancelled: worker pool shut down")
+            self._free -= 1
+            worker = self._idle.pop() if self._idle else None
+        try:
+            worker = worker or _Worker(self._context, self.memory_limit_mb)
+        except BaseException:
+            self._release(None)
+            raise
+        with self._cond:
+            self._busy.add(worker)
+        return worker
+
+    def _release(self, worker: _Worker = None):
+        # A None worker frees the slot; a fresh process is started the next time it is needed
+        with self._cond:
+            self._busy.discard(worker)
+            if worker is not None and self._closed:
+                worker.kill()
+            elif worker is not None:
+                self._idle.append(worker)
+            self._free += 1
+            self._cond.notify()
+
+    def run(self, func, args, timeout: float, wait_timeout: float = None):
+        """Run ``func(*args)`` in a worker; ``timeout`` starts when a worker picks the job up"""
+        worker = self._acquire(timeout if wait_timeout is None else wait_timeout)
+        reply = None
+        timed_out = False
+        try:
+            worker.conn.send((func, args))
+            if worker.conn.poll(timeout):
+                reply = worker.conn.recv()
+            else:
+                timed_out = True
+        except (EOFError, OSError):
+            pass
+        finally:
+            self._release(worker if reply is not None else None)
+            if reply is None:
+                worker.kill()
+
+        if reply is None:
+            if self._closed:
+                raise ExtractionCancelled("PDF extraction cancelled: worker pool shut down")
+            if timed_out:
+                raise TimeoutError(f"PDF extraction exceeded {timeout}s")
+            if self.memory_limit_mb:
+                raise MemoryError(f"PDF extraction worker died (memory limit {self.memory_limit_mb}MB)")
+            raise RuntimeError("PDF extraction worker died")
+        status, payload = reply
+        if status == 'memory':
+            raise MemoryError(f"PDF extraction exceeded {self.memory_limit_mb}MB")
+        if status == 'error':
+            raise RuntimeError(payload)
+        return payload
+
+    def shutdown(self):
+        with self._cond:
+            self._closed = True
+            idle, busy = self._idle, list(self._busy)
+            self._idle = []
+            self._cond.notify_all()
+        for worker in idle:
+            worker.kill()
+        # Running jobs see their pipe close and fail with ExtractionCancelled
+        for worker in busy:
+            worker.process.kill()
+
+
+class PDFTextExtractor:
+    """Extract PDF text through a backend, optionally in worker processes.
+
+    Documents with at least ``parallel_min_pages`` pages are split into page
+    chunks across ``workers`` processes. Whenever a timeout or memory limit is
+    set, extraction always runs out of process so a slow or malformed file can
+    be killed instead of hanging the request worker. The worker pool is
+    created on first use and shared by all requests; ``timeout`` bounds each
+    job from the moment a worker starts it, and waiting for a free worker is
+    bounded separately by DEFAULT_TIMEOUT.
+    """
+
+    def __init__(self, backend: str = None, workers: int = None, parallel_min_pages: int = 8,
+                 timeout: float = None, memory_limit_mb: int = None):
+        self.extractor = get_extractor(backend)
+        self.workers = workers or min(4, os.cpu_count() or 1)
+        self.parallel_min_pages = parallel_min_pages
+        self.timeout = timeout
+        self.memory_limit_mb = memory_limit_mb
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    @property
+    def backend(self) -> str:
+        return self.extractor.name
+
+    def _chunks(self, page_count: int) -> List[List[int]]:
+        if page_count == 0:
+            return []
+        if page_count < self.parallel_min_pages or self.workers <= 1:
+            return [list(range(page_count))]
+        size = -(-page_count // self.workers)
+        return [list(range(start, min(start + size, page_count))) for start in range(0, page_count, size)]
+
+    def _get_pool(self) -> WorkerPool:
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = WorkerPool(self.workers, self.memory_limit_mb)
+                atexit.register(self.shutdown)
+            return self._pool
+
+    def shutdown(self):
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown()
+
+    def extract(self, file_path: str) -> str:
+        isolated = self.timeout is not None or self.memory_limit_mb is not None
+        if not isolated:
+            chunks = self._chunks(self.extractor.page_count(file_path))
+            if not chunks:
+                return ''
+            if len(chunks) == 1:
+                return '\n'.join(self.extractor.extract_pages(file_path, chunks[0]))
+
+        timeout = self.timeout if self.timeout is not None else DEFAULT_TIMEOUT
+        pool = self._get_pool()
+        if isolated:
+            # Even opening the document happens out of process; malformed files can hang here
+            chunks = self._chunks(pool.run(_page_count, (self.backend, file_path), timeout, DEFAULT_TIMEOUT))
+
+        def run_chunk(chunk):
+            return pool.run(_extract_chunk, (self.backend, file_path, chunk), timeout, DEFAULT_TIMEOUT)
+
+        if len(chunks) <= 1:
+            results = [run_chunk(chunk) for chunk in chunks]
+        else:
+            # One waiting thread per chunk; each chunk holds its own worker and timer
+            with ThreadPoolExecutor(max_workers=len(chunks)) as dispatch:
+                results = list(dispatch.map(run_chunk, chunks))
+
+        return '\n'.join(text for chunk in results for text in chunk)
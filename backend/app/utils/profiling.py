@@ -0,0 +1,175 @@
+# On-demand and slow-request profiling for the model-backed endpoints
+import os
+import sys
+import time
+import uuid
+import hmac
+import cProfile
+import threading
+from collections import Counter
+from flask import g, request, current_app
+
+# Blueprint endpoints that may be profiled
+PROFILED_ENDPOINTS = {'main.upload_resume', 'main.analyze_job', 'main.get_match_score'}
+PROFILE_EXTENSIONS = {'cprofile': 'pstats', 'sample': 'collapsed'}
+
+_prune_lock = threading.Lock()
+
+
+class SamplingProfiler:
+    """Samples one thread's stack at a fixed interval and aggregates collapsed stacks.
+
+    Cheap enough to leave running on every profiled request, which is what
+    makes slow-request capture possible: the profile is kept only if the
+    request turns out to be an outlier.
+    """
+
+    def __init__(self, thread_id: int, interval: float = 0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}:{frame.f_lineno}")
+                frame = frame.f_back
+            self.stacks[';'.join(reversed(stack))] += 1
+
+    def write(self, path: str):
+        # Brendan Gregg's collapsed format, readable by flamegraph.pl / speedscope
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+def is_admin(app) -> bool:
+    token = app.config.get('ADMIN_TOKEN')
+    supplied = request.headers.get('X-Admin-Token', '')
+    # Compare bytes: compare_digest rejects str containing non-ASCII characters
+    return bool(token) and hmac.compare_digest(supplied.encode('utf-8'), token.encode('utf-8'))
+
+
+def requested_mode(app):
+    """Profiling mode explicitly asked for via X-Profile header or ?profile=, if the caller is an admin"""
+    mode = request.headers.get('X-Profile') or request.args.get('profile')
+    if not mode or not is_admin(app):
+        return None
+    mode = mode.lower()
+    if mode in ('1', 'true', 'yes'):
+        return 'cprofile'
+    return mode if mode in PROFILE_EXTENSIONS else None
+
+
+def _start_profile():
+    app = current_app._get_current_object()
+    if request.endpoint not in PROFILED_ENDPOINTS:
+        return
+
+    mode = requested_mode(app)
+    explicit = mode is not None
+    if not explicit and app.config['PROFILE_SLOW_REQUEST_MS']:
+        mode = 'sample'
+    if not mode:
+        return
+
+    if mode == 'cprofile':
+        profiler = cProfile.Profile()
+        profiler.enable()
+    else:
+        profiler = SamplingProfiler(threading.get_ident(), app.config['PROFILE_SAMPLE_INTERVAL_MS'] / 1000)
+        profiler.start()
+
+    g.profile = {'mode': mode, 'profiler': profiler, 'explicit': explicit, 'start': time.perf_counter()}
+
+
+def _prune_profiles(directory: str, max_files: int):
+    """Delete the oldest stored profiles so at most ``max_files`` remain"""
+    if max_files <= 0:
+        return
+    suffixes = tuple(f".{ext}" for ext in PROFILE_EXTENSIONS.values())
+    with _prune_lock:
+        try:
+            entries = [e for e in os.scandir(directory) if e.is_file() and e.name.endswith(suffixes)]
+        except OSError:
+            return
+        if len(entries) <= max_files:
+            return
+        entries.sort(key=lambda e: e.stat().st_mtime)
+        for entry in entries[:len(entries) - max_files]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                # Already removed by another worker
+                pass
+
+
+def _finish_profile(response):
+    state = g.pop('profile', None)
+    if state is None:
+        return response
+
+    profiler = state['profiler']
+    if state['mode'] == 'cprofile':
+        profiler.disable()
+    else:
+        profiler.stop()
+
+    app = current_app._get_current_object()
+    elapsed_ms = (time.perf_counter() - state['start']) * 1000
+    threshold = app.config['PROFILE_SLOW_REQUEST_MS']
+    if not state['explicit'] and elapsed_ms < threshold:
+        return response
+
+    profile_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{request.endpoint.split('.')[-1]}-{uuid.uuid4().hex[:8]}"
+    path = os.path.join(app.config['PROFILE_DIR'], f"{profile_id}.{PROFILE_EXTENSIONS[state['mode']]}")
+    try:
+        if state['mode'] == 'cprofile':
+            profiler.dump_stats(path)
+        else:
+            profiler.write(path)
+    except OSError as e:
+        app.logger.warning(f"Failed to store profile: {e}")
+        return response
+    _prune_profiles(app.config['PROFILE_DIR'], app.config['PROFILE_MAX_FILES'])
+
+    if state['explicit']:
+        # Timing is only disclosed to the admin who asked for the profile
+        response.headers['X-Profile-Id'] = profile_id
+        response.headers['Server-Timing'] = f"app;dur={elapsed_ms:.1f}"
+    else:
+        app.logger.warning(f"Slow request {request.path} took {elapsed_ms:.0f}ms; profile {profile_id}")
+    return response
+
+
+def _discard_profile(exc):
+    # A request that ended without a response must not leave a sampler thread running
+    state = g.pop('profile', None)
+    if state is None:
+        return
+    if state['mode'] == 'cprofile':
+        state['profiler'].disable()
+    else:
+        state['profiler'].stop()
+
+
+def init_profiling(app):
+    """Register profiling hooks; explicit profiling requires ADMIN_TOKEN to be configured"""
+    os.makedirs(app.config['PROFILE_DIR'], exist_ok=True)
+    app.before_request(_start_profile)
+    app.after_request(_finish_profile)
+    app.teardown_request(_discard_profile)
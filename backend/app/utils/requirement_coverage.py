@@ -0,0 +1,45 @@
+# Split job requirements and resume text into the units compared by the coverage matrix
+import re
+from typing import List
+from sklearn.feature_extraction.text import HashingVectorizer
+
+from app.utils.normalized_text import NormalizedDocument, collapse_whitespace, document_terms
+
+# Bullet markers and separators inside a captured requirements block
+_BULLET_SPLIT = re.compile(r'\n+|;\s*|(?:^|\s)[•·▪●◦*-]\s+')
+_SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+')
+MIN_WORDS = 2
+
+
+def split_requirements(blocks: List[str]) -> List[str]:
+    """Individual requirement bullets from JobDescriptionProcessor.extract_requirements blocks"""
+    seen = set()
+    bullets = []
+    for block in blocks or []:
+        for part in _BULLET_SPLIT.split(block):
+            bullet = collapse_whitespace(part).strip(' :.-')
+            key = bullet.lower()
+            if len(bullet.split()) >= MIN_WORDS and key not in seen:
+                seen.add(key)
+                bullets.append(bullet)
+    return bullets
+
+
+def split_sentences(text: str, max_words: int = 30) -> List[str]:
+    """Sentences of a resume; long runs without punctuation are cut into max_words windows"""
+    sentences = []
+    for sentence in _SENTENCE_SPLIT.split(text or ''):
+        words = sentence.split()
+        for start in range(0, len(words), max_words):
+            window = words[start:start + max_words]
+            if len(window) >= MIN_WORDS:
+                sentences.append(' '.join(window))
+    return sentences
+
+
+# Stateless term vectors: requirement rows stay valid for every later candidate, unlike a per-pair TF-IDF fit
+lexical_vectorizer = HashingVectorizer(analyzer=document_terms, n_features=2 ** 18, alternate_sign=False, norm='l2')
+
+
+def lexical_vectors(texts: List[str]):
+    return lexical_vectorizer.transform([NormalizedDocument(text) for text in texts])
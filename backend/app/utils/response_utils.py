@@ -0,0 +1,67 @@
+# Response shaping: field selection, compact mode and compression
+import gzip
+from typing import Dict, Any, Optional, Iterable
+
+# Fields kept when a client asks for compact output
+COMPACT_FIELDS = {
+    'resume': ['resume_id', 'word_count', 'char_count'],
+    'job': ['job_id', 'word_count', 'sentence_count'],
+    'match': ['resume_id', 'job_id', 'overall_score', 'scores', 'confidence_level', 'recommendation', 'degraded'],
+    'coverage': ['resume_id', 'job_id', 'requirement_count', 'satisfied_count', 'coverage_percentage', 'degraded'],
+}
+
+
+def parse_fields(raw: Optional[str]) -> Optional[list]:
+    """Parse a ?fields=a,b,c query value into a list, or None if absent"""
+    if not raw:
+        return None
+    fields = [f.strip() for f in raw.split(',') if f.strip()]
+    return fields or None
+
+
+def is_compact(args) -> bool:
+    return args.get('compact', '').lower() in ('1', 'true', 'yes')
+
+
+def select_fields(data: Dict[str, Any], fields: Iterable[str]) -> Dict[str, Any]:
+    """Keep only the requested top-level keys (dotted paths select nested keys)"""
+    selected = {}
+    for field in fields:
+        head, _, rest = field.partition('.')
+        if head not in data:
+            continue
+        if rest and isinstance(data[head], dict):
+            nested = select_fields(data[head], [rest])
+            selected.setdefault(head, {}).update(nested)
+        else:
+            selected[head] = data[head]
+    return selected
+
+
+def shape_response(data: Dict[str, Any], kind: str, args) -> Dict[str, Any]:
+    """Apply ?fields= and ?compact= to a response payload"""
+    fields = parse_fields(args.get('fields'))
+    if fields:
+        return select_fields(data, fields)
+    if is_compact(args):
+        return select_fields(data, COMPACT_FIELDS[kind])
+    return data
+
+
+def compress_response(response, request, min_size: int, level: int):
+    """Gzip a response in place when the client accepts it and it is large enough"""
+    if (response.direct_passthrough or response.is_streamed
+            or response.status_code < 200 or response.status_code >= 300
+            or 'Content-Encoding' in response.headers
+            or 'gzip' not in request.headers.get('Accept-Encoding', '').lower()):
+        return response
+
+    body = response.get_data()
+    if len(body) < min_size:
+        return response
+
+    response.set_data(gzip.compress(body, compresslevel=level))
+    response.headers['Content-Encoding'] = 'gzip'
+    response.headers['Content-Length'] = str(len(response.get_data()))
+    response.vary.add('Accept-Encoding')
+    return response
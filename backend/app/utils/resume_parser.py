@@ -1,45 +1,64 @@
 import os
 import re
-from pdfminer.high_level import extract_text
-from docx import Document
 from werkzeug.utils import secure_filename
 import tempfile
+from app.utils.text_hash import content_id
+from app.utils.normalized_text import strip_punctuation
+from app.utils.pdf_extractors import PDFTextExtractor
+from app.utils.docx_extractor import extract_docx_text
+from app.utils.artifact_cache import ArtifactCache, content_hash, version_tag
+from app.utils.admission import admission, Overloaded
+
+# Bump when extraction or cleaning changes so cached parses are invalidated
+PARSER_VERSION = 1
 
 class ResumeParser:
     def __init__(self):
         self.allowed_extensions = {'pdf', 'docx', 'doc'}
+
+        # PDF backend (auto, pdfium, pdfminer, pdfplumber) and per-file limits
+        timeout = os.getenv('PDF_TIMEOUT')
+        memory_limit = os.getenv('PDF_MEMORY_LIMIT_MB')
+        self.pdf_extractor = PDFTextExtractor(
+            backend=os.getenv('PDF_BACKEND', 'auto'),
+            workers=int(os.getenv('PDF_WORKERS', 0)) or None,
+            parallel_min_pages=int(os.getenv('PDF_PARALLEL_MIN_PAGES', 8)),
+            timeout=float(timeout) if timeout else None,
+            memory_limit_mb=int(memory_limit) if memory_limit else None
+        )
+
+        # Parsed resumes keyed by file hash; identical uploads skip extraction entirely
+        self.cache = ArtifactCache(
+            'resumes',
+            version_tag(PARSER_VERSION, self.pdf_extractor.backend),
+            max_entries=int(os.getenv('ARTIFACT_CACHE_SIZE', 1024)),
+            disk_dir=os.getenv('ARTIFACT_CACHE_DIR') or None
+        )
     
     def is_allowed_file(self, filename):
         return '.' in filename and filename.rsplit('.',1)[1].lower() in self.allowed_extensions
 
     def extract_text_from_pdf(self, file_path):
         try:
-            text = extract_text(file_path)
+            text = self.pdf_extractor.extract(file_path)
             return text
         except Exception as e:
             raise Exception(f"Error extracting PDF text: {str(e)}")
     
     def extract_text_from_docx(self, file_path):
         try:
-            doc = Document(file_path)
-            text = []
-            for paragraph in doc.paragraphs:
-                text.append(paragraph.text)
-            return '\n'.join(text)
+            # Streams word/document.xml: paragraphs and table cells in order, media skipped
+            return extract_docx_text(file_path)
         except Exception as e:
             raise Exception(f"Error extracting DOCX text: {str(e)}")
     
     def clean_text(self, text):
-        if not text:
-            return ""
-        text = ''.join(text.split())
-        text = re.sub(r'[^\w\s@.-]', ' ', text)
-        text = re.sub(r'\s+', ' ',text).strip()
-
-        return text
+        # Same punctuation/whitespace rules as NormalizedDocument, but case-preserving for contact extraction
+        return strip_punctuation(text)
     
     def extract_basic_info(self, text):
         info = {
+            'resume_id': content_id(text),
             'raw_text': text,
             'word_count': len(text.split()),
             'char_count': len(text)
@@ -63,34 +82,47 @@ class ResumeParser:
             if not self.is_allowed_file(filename):
                 raise ValueError("File type not allowed. Please upload a PDF or DOCX file.")
             
+            file_extension = filename.rsplit('.', 1)[1].lower()
+            file_bytes = file.read()
+            cache_key = f"{content_hash(file_bytes)}.{file_extension}"
+
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return dict(cached, filename = filename, cached = True)
+
             #Temporary file
             with tempfile.NamedTemporaryFile(delete = False, suffix = os.path.splitext(filename)[1]) as temp_file:
-                file.save(temp_file.name)
+                temp_file.write(file_bytes)
                 temp_file_path = temp_file.name
             
             try:
-                file_extension = filename.rsplit('.', 1)[1].lower()
 
-                if file_extension =='pdf':
-                    raw_text = self.extract_text_from_pdf(temp_file_path)
-                elif file_extension in ['docx', 'doc']:
-                    raw_text = self.extract_text_from_docx(temp_file_path)
-                else:
-                    raise ValueError("Unsupported file type") 
+                # Only cache misses take a parsing slot
+                with admission.slot('parsing'):
+                    if file_extension =='pdf':
+                        raw_text = self.extract_text_from_pdf(temp_file_path)
+                    elif file_extension in ['docx', 'doc']:
+                        raw_text = self.extract_text_from_docx(temp_file_path)
+                    else:
+                        raise ValueError("Unsupported file type") 
 
                 cleaned_text = self.clean_text(raw_text)
 
                 resume_info = self.extract_basic_info(cleaned_text)
 
-                return {
+                result = {
                     'success': True,
                     'filename': filename,
                     'file_type': file_extension,
                     'data': resume_info
-                } 
+                }
+                self.cache.set(cache_key, result)
+                return dict(result, cached = False)
             finally:
                 if os.path.exists(temp_file_path):
                     os.unlink(temp_file_path)
+        except Overloaded:
+            raise
         except Exception as e:
             return {
                 'success': False,
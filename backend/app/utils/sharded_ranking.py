@@ -0,0 +1,236 @@
+# Sharded, multi-process candidate ranking with scatter-gather top-K
+import heapq
+import multiprocessing
+import threading
+import time
+from typing import Dict, List, Tuple, Any
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from app.utils.normalized_text import NormalizedDocument, document_terms
+from app.utils.keywords import top_keywords
+from app.utils.match_engine import SCORER_WEIGHTS
+from app.utils.job_processor import TECH_SKILLS
+
+
+class CandidateShard:
+    """One partition of the candidate corpus, scored with vectorized matrix operations.
+
+    Holds L2-normalized TF-IDF rows (sparse), L2-normalized embeddings (float32,
+    optional) and a boolean candidate x skill matrix. Scores use the same
+    weights as AIMatchEngine.calculate_comprehensive_match, re-normalized over
+    the scorers that apply to the query and computed against a corpus-wide
+    IDF instead of a per-pair fit.
+    """
+
+    def __init__(self, ids: List[str], tfidf, embeddings, skills: np.ndarray):
+        self.ids = ids
+        self.tfidf = tfidf.tocsr()
+        self.embeddings = embeddings
+        self.skills = skills
+
+    def top_k(self, query: Dict[str, Any], k: int) -> List[Tuple[float, str, Dict[str, float]]]:
+        n = len(self.ids)
+        if n == 0:
+            return []
+
+        query_tfidf = np.asarray(query['tfidf'].todense()).ravel()
+        tfidf = self.tfidf @ query_tfidf
+
+        weights = {'tfidf_similarity': SCORER_WEIGHTS['tfidf_similarity'],
+                   'keyword_coverage': SCORER_WEIGHTS['keyword_coverage']}
+
+        if self.embeddings is not None and query.get('embedding') is not None:
+            embedding = self.embeddings @ query['embedding']
+            weights['embedding_similarity'] = SCORER_WEIGHTS['embedding_similarity']
+        else:
+            embedding = np.zeros(n, dtype=np.float32)
+
+        skill_idx = query['skill_idx']
+        if len(skill_idx):
+            skill = self.skills[:, skill_idx].sum(axis=1) / len(skill_idx) * 100
+            weights['skill_match'] = SCORER_WEIGHTS['skill_match']
+        else:
+            skill = np.zeros(n)
+
+        keyword_idx = query['keyword_idx']
+        keyword_total = query['keyword_total']
+        if keyword_total:
+            present = (self.tfidf[:, keyword_idx] > 0).sum(axis=1) if len(keyword_idx) else np.zeros((n, 1))
+            keyword = np.asarray(present).ravel() / keyword_total * 100
+        else:
+            keyword = np.zeros(n)
+
+        # Re-normalize over the scorers that apply, so a missing signal does not cap the score
+        total_weight = sum(weights.values())
+        overall = (
+            weights['tfidf_similarity'] * tfidf * 100
+            + weights.get('embedding_similarity', 0) * embedding * 100
+            + weights.get('skill_match', 0) * skill
+            + weights['keyword_coverage'] * keyword
+        ) / total_weight
+
+        k = min(k, n)
+        top = np.argpartition(-overall, k - 1)[:k]
+        return [
+            (float(overall[i]), self.ids[i], {
+                'tfidf_similarity': round(float(tfidf[i]) * 100, 2),
+                'ai_similarity': round(float(embedding[i]) * 100, 2),
+                'skill_match': round(float(skill[i]), 2),
+                'keyword_coverage': round(float(keyword[i]), 2)
+            })
+            for i in top
+        ]
+
+
+def _shard_worker(conn, shard: CandidateShard):
+    # Long-lived shard server: answers top-K queries until told to stop
+    while True:
+        message = conn.recv()
+        if message[0] == 'stop':
+            break
+        _, query, k = message
+        try:
+            conn.send(('ok', shard.top_k(query, k)))
+        except Exception as e:
+            conn.send(('error', str(e)))
+    conn.close()
+
+
+class ShardedRanker:
+    """Coordinator that partitions a candidate corpus across worker processes.
+
+    ``build`` vectorizes the corpus once (TF-IDF vocabulary and IDF, embeddings
+    and skill vectors), then ``start`` forks one process per shard. ``rank``
+    scatters the job query to every shard and merges their local top-K lists
+    into the global ranking. ``skills`` defaults to the JobDescriptionProcessor
+    taxonomy.
+    """
+
+    def __init__(self, num_shards: int = None, engine=None, skills: List[str] = None,
+                 max_features: int = 2 ** 18):
+        self.num_shards = num_shards or multiprocessing.cpu_count()
+        self.engine = engine
+        if skills is None:
+            skills = [skill for category in TECH_SKILLS.values() for skill in category]
+        self.skills = sorted(set(skills))
+        self.skill_index = {skill: i for i, skill in enumerate(self.skills)}
+        self.vectorizer = TfidfVectorizer(analyzer=document_terms, max_features=max_features)
+        self.shards: List[CandidateShard] = []
+        self._workers = []
+        # One scatter/gather cycle at a time, so concurrent callers never read each other's replies
+        self._rank_lock = threading.Lock()
+        self.size = 0
+
+    def _skill_vector(self, text_lower: str) -> np.ndarray:
+        return np.array([skill in text_lower for skill in self.skills], dtype=bool)
+
+    def _embed(self, texts: List[str]):
+        if self.engine is None or not self.engine.embeddings_available():
+            return None
+        if self.engine.sentence_model:
+            # Batch-encode directly so a large corpus does not churn the engine's embedding cache
+            vectors = self.engine.get_embeddings_sentence_transformer(texts, batch_size=256)
+        else:
+            vectors = self.engine.get_embeddings(texts)
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
+
+    def build(self, candidates: List[Tuple[str, str]]):
+        """Vectorize (id, text) candidates and split them into contiguous shards"""
+        ids = [doc_id for doc_id, _ in candidates]
+        docs = [NormalizedDocument(text) for _, text in candidates]
+        tfidf = self.vectorizer.fit_transform(docs).tocsr()
+        embeddings = self._embed([doc.text for doc in docs])
+        skills = np.vstack([self._skill_vector(text.lower()) for _, text in candidates]) \
+            if self.skills else np.zeros((len(candidates), 0), dtype=bool)
+
+        bounds = np.linspace(0, len(ids), self.num_shards + 1, dtype=int)
+        self.shards = [
+            CandidateShard(
+                ids[start:stop],
+                tfidf[start:stop],
+                embeddings[start:stop] if embeddings is not None else None,
+                skills[start:stop]
+            )
+            for start, stop in zip(bounds[:-1], bounds[1:])
+        ]
+        self.size = len(ids)
+        return self
+
+    def start(self):
+        """Fork one server process per shard"""
+        for shard in self.shards:
+            parent_conn, child_conn = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_shard_worker, args=(child_conn, shard), daemon=True)
+            process.start()
+            child_conn.close()
+            self._workers.append((process, parent_conn))
+        return self
+
+    def stop(self):
+        with self._rank_lock:
+            self._stop_workers()
+
+    def _stop_workers(self):
+        for process, conn in self._workers:
+            try:
+                conn.send(('stop',))
+            except (BrokenPipeError, OSError):
+                pass
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self._workers = []
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def build_query(self, job_text: str, job_skills: List[str] = None) -> Dict[str, Any]:
+        doc = NormalizedDocument(job_text)
+        vocabulary = self.vectorizer.vocabulary_
+        keywords = [term for term, _ in top_keywords(doc.term_counts)]
+        if job_skills is None:
+            job_skills = [skill for skill in self.skills if skill in job_text.lower()]
+        embedding = self._embed([doc.text])
+        return {
+            'tfidf': self.vectorizer.transform([doc]),
+            'embedding': embedding[0] if embedding is not None else None,
+            'skill_idx': np.array([self.skill_index[s] for s in job_skills if s in self.skill_index], dtype=int),
+            'keyword_idx': np.array([vocabulary[t] for t in keywords if t in vocabulary], dtype=int),
+            'keyword_total': len(keywords)
+        }
+
+    def rank(self, job_text: str, k: int = 10, job_skills: List[str] = None) -> Dict[str, Any]:
+        """Scatter the query to every shard and merge the per-shard top-K heaps"""
+        started = time.perf_counter()
+        query = self.build_query(job_text, job_skills)
+
+        if self._workers:
+            with self._rank_lock:
+                for _, conn in self._workers:
+                    conn.send(('query', query, k))
+                # Drain every shard's reply before reporting a failure, so none is left in a pipe
+                replies = [conn.recv() for _, conn in self._workers]
+            errors = [payload for status, payload in replies if status != 'ok']
+            if errors:
+                raise RuntimeError(f"Shard failed: {'; '.join(errors)}")
+            partials = [payload for _, payload in replies]
+        else:
+            # Not started: score shards in-process (useful for tests and small corpora)
+            partials = [shard.top_k(query, k) for shard in self.shards]
+
+        best = heapq.nlargest(k, (entry for partial in partials for entry in partial), key=lambda e: e[0])
+        return {
+            'total_candidates': self.size,
+            'shards': len(self.shards),
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 2),
+            'results': [
+                {'candidate_id': doc_id, 'overall_score': round(score, 2), 'scores': scores}
+                for score, doc_id, scores in best
+            ]
+        }
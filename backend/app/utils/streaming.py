@@ -0,0 +1,72 @@
+# Streaming (NDJSON / Server-Sent Events) helpers for long-running rankings
+import heapq
+from typing import Dict, Any, Iterable, Iterator, Callable
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+SSE_MIMETYPE = 'text/event-stream'
+
+
+def format_ndjson(payload: Dict[str, Any], dumps: Callable) -> str:
+    return dumps(payload) + '\n'
+
+
+def format_sse(payload: Dict[str, Any], dumps: Callable, event: str = 'message') -> str:
+    return f"event: {event}\ndata: {dumps(payload)}\n\n"
+
+
+class TopK:
+    """Bounded min-heap holding the K best scored candidates seen so far"""
+
+    def __init__(self, k: int):
+        self.k = k
+        self._heap = []
+        self._counter = 0
+
+    def push(self, score: float, item: Dict[str, Any]) -> bool:
+        """Add an item; return True if the top-K set changed"""
+        self._counter += 1
+        entry = (score, self._counter, item)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+            return True
+        if score > self._heap[0][0]:
+            heapq.heapreplace(self._heap, entry)
+            return True
+        return False
+
+    def ranked(self):
+        return [item for _, _, item in sorted(self._heap, key=lambda e: (-e[0], e[1]))]
+
+
+def stream_rankings(scored: Iterable[Dict[str, Any]], mode: str, top_k: int,
+                    fmt: str, dumps: Callable) -> Iterator[str]:
+    """Turn an iterator of scored pairs into NDJSON lines or SSE events.
+
+    mode='pairs' emits every scored pair as it is computed; mode='topk' emits
+    the current top-K only when it changes. Only the top-K heap is retained, so
+    memory stays bounded regardless of pool size. Closing the generator (client
+    disconnect) closes the upstream iterator and stops the remaining work.
+    """
+    def emit(payload, event):
+        if fmt == 'sse':
+            return format_sse(payload, dumps, event)
+        return format_ndjson(dict(payload, type=event), dumps)
+
+    best = TopK(top_k)
+    processed = 0
+    try:
+        for result in scored:
+            processed += 1
+            if 'error' in result:
+                yield emit(result, 'error')
+                continue
+            changed = best.push(result['overall_score'], result)
+            if mode == 'pairs':
+                yield emit(result, 'pair')
+            elif changed:
+                yield emit({'processed': processed, 'top_k': best.ranked()}, 'topk')
+        yield emit({'processed': processed, 'top_k': best.ranked()}, 'done')
+    finally:
+        close = getattr(scored, 'close', None)
+        if close:
+            close()
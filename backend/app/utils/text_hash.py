@@ -0,0 +1,8 @@
+import hashlib
+
+
+def content_id(text) -> str:
+    """Stable short ID for a document derived from its text or bytes"""
+    if isinstance(text, str):
+        text = text.encode('utf-8')
+    return hashlib.sha1(text or b'').hexdigest()[:16]
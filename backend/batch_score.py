@@ -0,0 +1,41 @@
+"""Score resume/job pairs offline and write columnar results.
+
+Example:
+    python batch_score.py --resumes resumes.jsonl --jobs jobs.jsonl --output scores/ --workers 8
+"""
+import argparse
+import json
+from dotenv import load_dotenv
+
+from app.utils.batch_scoring import BatchScorer
+
+load_dotenv()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--resumes', required=True, help='resumes as .jsonl or .parquet')
+    parser.add_argument('--jobs', required=True, help='job descriptions as .jsonl or .parquet')
+    parser.add_argument('--pairs', help='optional (resume_id, job_id) pairs; default scores every resume against every job')
+    parser.add_argument('--output', required=True, help='output directory (re-run with the same one to resume)')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: all cores)')
+    parser.add_argument('--chunk-size', type=int, default=50000, help='pairs per checkpointed output part')
+    parser.add_argument('--embed-batch-size', type=int, default=256)
+    parser.add_argument('--id-field', default='id')
+    parser.add_argument('--text-field', default='text')
+    args = parser.parse_args()
+
+    scorer = BatchScorer(
+        args.output,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        embed_batch_size=args.embed_batch_size,
+        id_field=args.id_field,
+        text_field=args.text_field
+    )
+    summary = scorer.run(args.resumes, args.jobs, args.pairs)
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == '__main__':
+    main()
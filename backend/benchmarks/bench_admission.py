@@ -0,0 +1,112 @@
+"""Open-loop load test of resume uploads with and without admission control.
+
+Requests arrive at a fixed rate regardless of how fast the app answers (as
+real clients do), so past saturation an ungated app builds an unbounded
+backlog and every request misses its deadline. Goodput counts only 200
+responses that finish within --slo-ms of their scheduled arrival. Run from
+the backend directory:
+    python -m benchmarks.bench_admission --load 0.5 1 2 4 --duration 10
+"""
+import argparse
+import io
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+os.environ.setdefault('PDF_BACKEND', 'pdfminer')
+# No parse cache, so every upload does real extraction work
+os.environ.setdefault('ARTIFACT_CACHE_SIZE', '0')
+os.environ.setdefault('MAX_CONTENT_LENGTH', str(16 * 1024 * 1024))
+
+from app import create_app
+from app.utils.admission import AdmissionController, admission
+from benchmarks.pdf_corpus import pdf_bytes
+
+
+def percentile(values, q):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def run_load(app, uploads, rate, duration, slo_ms, clients):
+    client = app.test_client()
+    results = []
+    lock = threading.Lock()
+
+    def send(body, scheduled):
+        response = client.post('/api/upload-resume', data={'resume': (io.BytesIO(body), 'resume.pdf')},
+                               content_type='multipart/form-data')
+        latency = (time.perf_counter() - scheduled) * 1000
+        with lock:
+            results.append((response.status_code, latency))
+
+    total = int(rate * duration)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        for i in range(total):
+            scheduled = start + i / rate
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(send, uploads[i % len(uploads)], scheduled)
+    elapsed = time.perf_counter() - start
+
+    ok = [latency for status, latency in results if status == 200]
+    good = [latency for latency in ok if latency <= slo_ms]
+    shed = sum(1 for status, _ in results if status in (429, 503))
+    return {
+        'offered_rps': rate,
+        'goodput_rps': len(good) / elapsed,
+        'ok': len(ok),
+        'shed': shed,
+        'errors': len(results) - len(ok) - shed,
+        'p50_ms': percentile(ok, 0.5),
+        'p99_ms': percentile(ok, 0.99)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--load', type=float, nargs='+', default=[0.5, 1, 2, 4],
+                        help='offered load as a multiple of measured single-stream capacity')
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--pages', type=int, default=2)
+    parser.add_argument('--slo-ms', type=float, default=2000)
+    parser.add_argument('--concurrency', type=int, default=os.cpu_count() or 1, help='parsing slots when gated')
+    parser.add_argument('--queue', type=int, default=None, help='queued uploads when gated (default 2x slots)')
+    parser.add_argument('--clients', type=int, default=64)
+    args = parser.parse_args()
+
+    app = create_app('testing')
+    uploads = [pdf_bytes(args.pages, seed=i) for i in range(20)]
+    client = app.test_client()
+
+    start = time.perf_counter()
+    for body in uploads[-5:]:
+        client.post('/api/upload-resume', data={'resume': (io.BytesIO(body), 'resume.pdf')},
+                    content_type='multipart/form-data')
+    service = (time.perf_counter() - start) / 5
+    capacity = 1 / service
+    print(f"service time {service * 1000:.0f} ms -> capacity ~{capacity:.1f} req/s, SLO {args.slo_ms:.0f} ms")
+
+    queue = args.queue if args.queue is not None else 2 * args.concurrency
+    configs = {
+        'ungated': AdmissionController({}, {}, args.slo_ms),
+        'gated': AdmissionController({'parsing': args.concurrency}, {'parsing': queue}, args.slo_ms / 2)
+    }
+    print(f"{'mode':>8}{'load':>6}{'offered':>9}{'goodput':>9}{'ok':>6}{'shed':>6}{'err':>5}{'p50 ms':>9}{'p99 ms':>9}")
+    for load in args.load:
+        for mode, controller in configs.items():
+            admission.gates = controller.gates
+            report = run_load(app, uploads, load * capacity, args.duration, args.slo_ms, args.clients)
+            p50 = f"{report['p50_ms']:.0f}" if report['p50_ms'] is not None else '-'
+            p99 = f"{report['p99_ms']:.0f}" if report['p99_ms'] is not None else '-'
+            print(f"{mode:>8}{load:>6.1f}{report['offered_rps']:>9.1f}{report['goodput_rps']:>9.1f}"
+                  f"{report['ok']:>6}{report['shed']:>6}{report['errors']:>5}{p50:>9}{p99:>9}")
+
+
+if __name__ == '__main__':
+    main()
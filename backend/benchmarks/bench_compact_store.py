@@ -0,0 +1,131 @@
+"""Benchmark memory of the compact columnar store against nested parse-result dicts.
+
+The dict layout mirrors what the app keeps per document today: the
+parse_resume result plus token list, sentence list, entity dicts and a
+float32 embedding. Run from the backend directory:
+    python -m benchmarks.bench_compact_store --docs 20000 --dim 384
+"""
+import argparse
+import gc
+import random
+import re
+import time
+import tracemalloc
+import numpy as np
+
+from app.utils.compact_store import CompactCorpus
+from app.utils.normalized_text import NormalizedDocument
+from app.utils.text_hash import content_id
+
+WORDS = ['Python', 'Django', 'React', 'AWS', 'Docker', 'Kubernetes', 'SQL', 'team', 'experience',
+         'developed', 'designed', 'REST', 'APIs', 'cloud', 'Agile', 'testing', 'led', 'migrated',
+         'Java', 'Spring', 'Terraform', 'Redis', 'PostgreSQL', 'Linux', 'Git', 'Jenkins', 'services',
+         'customers', 'latency', 'pipeline', 'platform', 'reduced', 'improved', 'mentored', 'the', 'and']
+SKILLS = ['Python', 'Django', 'React', 'AWS', 'Docker', 'Kubernetes', 'Java', 'Redis', 'Linux']
+
+
+def synthetic_document(rng, words, dim):
+    sentences = []
+    for _ in range(words // 12):
+        sentences.append(' '.join(rng.choice(WORDS) for _ in range(12)) + '.')
+    text = ' '.join(sentences)
+    entities = [{'text': skill, 'label': 'TECH', 'description': 'Technical Skill'}
+                for skill in SKILLS if skill in text]
+    embedding = np.asarray([rng.gauss(0, 1) for _ in range(dim)], dtype=np.float32)
+    return {
+        'success': True,
+        'filename': f'resume_{rng.randrange(10 ** 6)}.pdf',
+        'file_type': 'pdf',
+        'data': {
+            'resume_id': content_id(text),
+            'raw_text': text,
+            'word_count': len(text.split()),
+            'char_count': len(text),
+            'emails': ['jane.doe@example.com'],
+            'phones': ['555-123-4567'],
+            'tokens': NormalizedDocument(text).tokens,
+            'sentences': re.split(r'(?<=\.)\s+', text),
+            'entities': entities,
+            'embedding': embedding
+        }
+    }
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    store = build()
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return store, current, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--docs', type=int, default=20000)
+    parser.add_argument('--words', type=int, default=600)
+    parser.add_argument('--dim', type=int, default=384)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    # Source documents are generated outside the measured region, then copied into each layout
+    seeds = [synthetic_document(rng, args.words, args.dim) for _ in range(min(args.docs, 500))]
+
+    def build_dicts():
+        store = {}
+        for i in range(args.docs):
+            seed = seeds[i % len(seeds)]
+            data = seed['data']
+            # Fresh objects per document, as separate uploads would produce
+            copy = dict(seed, data=dict(
+                data,
+                resume_id=f'{i}-{data["resume_id"]}',
+                raw_text=''.join(list(data['raw_text'])),
+                tokens=[''.join(list(t)) for t in data['tokens']],
+                sentences=[''.join(list(s)) for s in data['sentences']],
+                entities=[dict(e) for e in data['entities']],
+                embedding=data['embedding'].copy()
+            ))
+            store[copy['data']['resume_id']] = copy
+        return store
+
+    def build_compact():
+        corpus = CompactCorpus()
+        for i in range(args.docs):
+            seed = seeds[i % len(seeds)]
+            data = seed['data']
+            corpus.add(
+                f'{i}-{data["resume_id"]}', data['raw_text'], tokens=data['tokens'],
+                sentences=data['sentences'], entities=data['entities'], embedding=data['embedding'],
+                filename=seed['filename'], file_type=seed['file_type'],
+                emails=data['emails'], phones=data['phones']
+            )
+        return corpus
+
+    dicts, dict_bytes, dict_time = measure(build_dicts)
+    del dicts
+    corpus, compact_bytes, compact_time = measure(build_compact)
+
+    print(f"{args.docs} documents, ~{args.words} words, {args.dim}-dim embeddings")
+    print(f"{'layout':>10}{'MB':>10}{'bytes/doc':>12}{'build s':>10}")
+    print(f"{'dict':>10}{dict_bytes / 2 ** 20:>10.1f}{dict_bytes / args.docs:>12.0f}{dict_time:>10.2f}")
+    print(f"{'compact':>10}{compact_bytes / 2 ** 20:>10.1f}{compact_bytes / args.docs:>12.0f}{compact_time:>10.2f}")
+    print(f"reduction: {dict_bytes / compact_bytes:.1f}x")
+    for column, size in corpus.memory_usage().items():
+        print(f"  {column:<11}{size / 2 ** 20:>8.1f} MB")
+
+    # Cost of lazy rehydration
+    sample = [corpus.ids[i] for i in range(0, len(corpus), max(1, len(corpus) // 1000))]
+    start = time.perf_counter()
+    for doc_id in sample:
+        doc = corpus.get(doc_id)
+        doc.text, doc.tokens, doc.sentences, doc.embedding
+    per_doc = (time.perf_counter() - start) / len(sample) * 1e6
+    print(f"rehydrate text+tokens+sentences+embedding: {per_doc:.0f} us/doc")
+
+
+if __name__ == '__main__':
+    main()
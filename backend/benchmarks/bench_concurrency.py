@@ -0,0 +1,66 @@
+"""Benchmark match throughput with 1..N concurrent threads sharing one engine.
+
+Each worker scores distinct resume/job pairs (no match-cache hits). Run from
+the backend directory, optionally with thread-pool settings, e.g.:
+    TORCH_NUM_THREADS=1 BLAS_NUM_THREADS=1 python -m benchmarks.bench_concurrency --threads 1 2 4 8
+"""
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.utils.cpu_threads import configure_cpu_threads
+from app.utils.match_engine import AIMatchEngine
+
+WORDS = ['python', 'django', 'react', 'aws', 'docker', 'kubernetes', 'sql', 'team', 'experience',
+         'developed', 'designed', 'rest', 'apis', 'cloud', 'agile', 'testing', 'led', 'migrated']
+
+
+def synthetic_pairs(count, words, seed=0):
+    rng = random.Random(seed)
+    pairs = []
+    for i in range(count):
+        resume = ' '.join(rng.choice(WORDS) for _ in range(words))
+        job = ' '.join(rng.choice(WORDS) for _ in range(words // 4))
+        pairs.append((
+            {'data': {'raw_text': resume, 'resume_id': f'r{i}'}},
+            {'data': {'original_text': job, 'job_id': f'j{i}', 'skills': {'languages': ['python']}}}
+        ))
+    return pairs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 2, 4, os.cpu_count() or 1])
+    parser.add_argument('--pairs', type=int, default=200)
+    parser.add_argument('--words', type=int, default=800)
+    args = parser.parse_args()
+
+    applied = configure_cpu_threads(
+        int(os.getenv('TORCH_NUM_THREADS', 0)),
+        int(os.getenv('BLAS_NUM_THREADS', 0)),
+        max(args.threads)
+    )
+    print(f"thread pools: {applied}")
+
+    engine = AIMatchEngine()
+    print(f"{'threads':>8}{'pairs/s':>10}{'speedup':>9}")
+    baseline = None
+    for run, threads in enumerate(args.threads):
+        # Fresh IDs per run so no results come from the match cache
+        pairs = synthetic_pairs(args.pairs, args.words, seed=run)
+        for resume, job in pairs:
+            resume['data']['resume_id'] += f'-{run}'
+            job['data']['job_id'] += f'-{run}'
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            results = list(pool.map(lambda pair: engine.calculate_comprehensive_match(*pair), pairs))
+        rate = len(results) / (time.perf_counter() - start)
+        baseline = baseline or rate
+        print(f"{threads:>8}{rate:>10.1f}{rate / baseline:>9.2f}")
+        assert all(r['success'] for r in results)
+
+
+if __name__ == '__main__':
+    main()
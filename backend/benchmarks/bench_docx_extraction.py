@@ -0,0 +1,92 @@
+"""Benchmark the streaming DOCX extractor against python-docx.
+
+Generates resumes with paragraphs, a skills table and an embedded image, then
+compares time, peak Python memory and whether table text was recovered.
+Run from the backend directory:
+    python -m benchmarks.bench_docx_extraction --paragraphs 200 2000
+"""
+import argparse
+import os
+import random
+import struct
+import tempfile
+import time
+import tracemalloc
+import zlib
+from docx import Document
+from docx.shared import Inches
+
+from app.utils.docx_extractor import extract_docx_text
+
+WORDS = ['Python', 'Django', 'React', 'AWS', 'Docker', 'Kubernetes', 'SQL', 'team',
+         'experience', 'developed', 'designed', 'REST', 'APIs', 'cloud', 'Agile', 'testing']
+TABLE_SKILL = 'Terraform'
+
+
+def noise_png(path, size):
+    """Incompressible RGB PNG, standing in for a photo embedded in a resume"""
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+    raw = b''.join(b'\x00' + os.urandom(size * 3) for _ in range(size))
+    with open(path, 'wb') as f:
+        f.write(b'\x89PNG\r\n\x1a\n')
+        f.write(chunk(b'IHDR', struct.pack('>IIBBBBB', size, size, 8, 2, 0, 0, 0)))
+        f.write(chunk(b'IDAT', zlib.compress(raw, 1)))
+        f.write(chunk(b'IEND', b''))
+
+
+def make_docx(path, paragraphs, image):
+    rng = random.Random(paragraphs)
+    doc = Document()
+    doc.add_picture(image, width=Inches(2))
+    table = doc.add_table(rows=5, cols=3)
+    for row in table.rows:
+        for cell in row.cells:
+            cell.text = rng.choice(WORDS)
+    table.rows[0].cells[0].text = TABLE_SKILL
+    for _ in range(paragraphs):
+        doc.add_paragraph(' '.join(rng.choice(WORDS) for _ in range(15)))
+    doc.save(path)
+
+
+def python_docx_text(path):
+    doc = Document(path)
+    return '\n'.join(p.text for p in doc.paragraphs)
+
+
+def measure(fn, path, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        text = fn(path)
+    elapsed = (time.perf_counter() - start) / repeat * 1000
+    tracemalloc.start()
+    fn(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, text
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--paragraphs', type=int, nargs='+', default=[200, 2000])
+    parser.add_argument('--image-size', type=int, default=800, help='embedded image edge in pixels')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        image = os.path.join(tmp, 'photo.png')
+        noise_png(image, args.image_size)
+
+        print(f"{'extractor':<14}{'paragraphs':>11}{'file KiB':>10}{'ms':>9}{'peak KiB':>10}{'table text':>12}")
+        for paragraphs in args.paragraphs:
+            path = os.path.join(tmp, f'resume_{paragraphs}.docx')
+            make_docx(path, paragraphs, image)
+            size = os.path.getsize(path) / 1024
+            for name, fn in (('python-docx', python_docx_text), ('streaming', extract_docx_text)):
+                elapsed, peak, text = measure(fn, path, args.repeat)
+                print(f"{name:<14}{paragraphs:>11}{size:>10.0f}{elapsed:>9.1f}{peak / 1024:>10.0f}"
+                      f"{str(TABLE_SKILL in text):>12}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""Benchmark normalizing documents once vs. per scorer.
+
+Compares the old per-scorer path (preprocess_text three times and a fresh
+TfidfVectorizer analysis per fit) with a single NormalizedDocument shared by
+all scorers. Run from the backend directory:
+    python -m benchmarks.bench_normalization --pages 20
+"""
+import argparse
+import random
+import re
+import time
+import tracemalloc
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from app.utils.normalized_text import NormalizedDocument
+
+WORDS = ['Python', 'Django', 'React.js', 'AWS', 'Docker', 'Kubernetes', 'SQL', 'team',
+         'experience', 'developed', 'designed', 'REST', 'APIs', 'cloud', 'Agile', 'testing',
+         'the', 'and', 'with', 'for', 'led', 'C++', 'C#', 'e-mail:', 'john@doe.com', '(2019-2023)']
+WORDS_PER_PAGE = 500
+
+
+def synthetic_resume(pages):
+    lines = []
+    for _ in range(pages * WORDS_PER_PAGE // 10):
+        lines.append('- ' + ' '.join(random.choice(WORDS) for _ in range(10)) + '.')
+    return '\n'.join(lines)
+
+
+def legacy_preprocess(text):
+    text = text.lower()
+    text = ' '.join(text.split())
+    text = re.sub(r'[^\w\s@.-]', ' ', text)
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def legacy_path(resume, job):
+    vectorizer = TfidfVectorizer(stop_words='english', max_features=5000, ngram_range=(1, 2))
+    # TF-IDF scorer
+    vectorizer.fit_transform([legacy_preprocess(resume), legacy_preprocess(job)])
+    # Embedding scorer input
+    texts = [legacy_preprocess(resume), legacy_preprocess(job)]
+    # Keyword scorer
+    job_clean = legacy_preprocess(job)
+    resume_clean = legacy_preprocess(resume)
+    vectorizer.fit_transform([job_clean])
+    return texts, resume_clean
+
+
+def shared_path(resume, job):
+    vectorizer = TfidfVectorizer(analyzer=lambda d: d.terms, max_features=5000)
+    resume_doc = NormalizedDocument(resume)
+    job_doc = NormalizedDocument(job)
+    vectorizer.fit_transform([resume_doc, job_doc])
+    texts = [resume_doc.text, job_doc.text]
+    vectorizer.fit_transform([job_doc])
+    return texts, resume_doc.text
+
+
+def measure(fn, resume, job, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(resume, job)
+    elapsed = (time.perf_counter() - start) / repeat * 1000
+
+    tracemalloc.start()
+    fn(resume, job)
+    _, peak = tracemalloc.get_traced_memory()
+    snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    blocks = sum(stat.count for stat in snapshot.statistics('filename'))
+    return elapsed, peak, blocks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--pages', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    random.seed(0)
+    resume = synthetic_resume(args.pages)
+    job = synthetic_resume(2)
+
+    print(f"resume: {len(resume.split())} words, job: {len(job.split())} words")
+    print(f"{'path':<10}{'ms':>10}{'peak KiB':>12}{'live blocks':>14}")
+    for name, fn in (('legacy', legacy_path), ('shared', shared_path)):
+        elapsed, peak, blocks = measure(fn, resume, job, args.repeat)
+        print(f"{name:<10}{elapsed:>10.1f}{peak / 1024:>12.0f}{blocks:>14}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+"""Benchmark PDF extraction backends, sequential vs. per-page parallel.
+
+Run from the backend directory:
+    python -m benchmarks.bench_pdf_extraction --pages 2 10 40
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from app.utils.pdf_extractors import EXTRACTORS, PDFTextExtractor
+from benchmarks.pdf_corpus import make_pdf
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--pages', type=int, nargs='+', default=[2, 10, 40])
+    parser.add_argument('--workers', type=int, default=min(4, os.cpu_count() or 1))
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    backends = [name for name, cls in EXTRACTORS.items() if cls.available()]
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = {n: make_pdf(os.path.join(tmp, f'resume_{n}.pdf'), n, seed=n) for n in args.pages}
+
+        print(f"{'backend':<12}{'pages':>6}{'sequential ms':>16}{'parallel ms':>14}{'chars':>9}")
+        for backend in backends:
+            sequential = PDFTextExtractor(backend, workers=1)
+            parallel = PDFTextExtractor(backend, workers=args.workers, parallel_min_pages=2)
+            for pages, path in corpus.items():
+                timings = []
+                for extractor in (sequential, parallel):
+                    start = time.perf_counter()
+                    for _ in range(args.repeat):
+                        text = extractor.extract(path)
+                    timings.append((time.perf_counter() - start) / args.repeat * 1000)
+                print(f"{backend:<12}{pages:>6}{timings[0]:>16.1f}{timings[1]:>14.1f}{len(text):>9}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""Benchmark response payload size and JSON serialization time.
+
+Run from the backend directory:
+    python -m benchmarks.bench_serialization --batch 200
+"""
+import argparse
+import gzip
+import json
+import random
+import time
+import numpy as np
+
+from app.utils.json_provider import _default, dumps_bytes, ORJSON_AVAILABLE
+from app.utils.response_utils import select_fields, COMPACT_FIELDS
+
+WORDS = ['python', 'django', 'react', 'aws', 'docker', 'kubernetes', 'sql', 'team',
+         'experience', 'develop', 'design', 'api', 'cloud', 'agile', 'testing', 'data']
+
+
+def synthetic_text(n_words):
+    return ' '.join(random.choice(WORDS) for _ in range(n_words))
+
+
+def synthetic_match(i):
+    """A match payload shaped like calculate_comprehensive_match output"""
+    keywords = [(w, np.float64(random.random())) for w in random.sample(WORDS, 10)]
+    return {
+        'resume_id': f'r{i:015d}',
+        'job_id': 'j000000000000001',
+        'overall_score': np.float64(random.uniform(0, 100)),
+        'confidence_level': 'Medium',
+        'scores': {k: np.float64(random.uniform(0, 100))
+                   for k in ('tfidf_similarity', 'ai_similarity', 'skill_match', 'keyword_coverage')},
+        'skill_analysis': {
+            'matched_skills': random.sample(WORDS, 5),
+            'missing_skills': random.sample(WORDS, 4),
+            'extra_skills': random.sample(WORDS, 6),
+            'skill_match_percentage': random.uniform(0, 100),
+        },
+        'keyword_analysis': {
+            'job_keywords': keywords,
+            'keyword_matches': [{'keyword': k, 'job_importance': s, 'in_resume': True} for k, s in keywords],
+            'keyword_coverage_percentage': random.uniform(0, 100),
+        },
+        'insights': [synthetic_text(15) for _ in range(4)],
+        'recommendation': 'Consider',
+    }
+
+
+def synthetic_job():
+    text = synthetic_text(600)
+    return {
+        'job_id': 'j000000000000001',
+        'original_text': text,
+        'cleaned_text': text,
+        'word_count': 600,
+        'sentence_count': 40,
+        'sentences': [synthetic_text(12) for _ in range(5)],
+        'tokens': text.split()[:50],
+        'skills': {'frameworks': ['django', 'react']},
+        'top_words': [(w, random.randint(1, 30)) for w in WORDS],
+    }
+
+
+def timeit(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        out = fn()
+    return (time.perf_counter() - start) / repeat * 1000, out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--batch', type=int, default=200, help='match results per response')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    random.seed(0)
+    payloads = {
+        'match_full': [synthetic_match(i) for i in range(args.batch)],
+        'job_full': synthetic_job(),
+    }
+    payloads['match_compact'] = [select_fields(m, COMPACT_FIELDS['match']) for m in payloads['match_full']]
+    payloads['job_compact'] = select_fields(payloads['job_full'], COMPACT_FIELDS['job'])
+
+    print(f"orjson available: {ORJSON_AVAILABLE}")
+    print(f"{'payload':<15}{'bytes':>10}{'gzip':>10}{'stdlib ms':>12}{'fast ms':>10}")
+    for name, obj in payloads.items():
+        std_ms, std_out = timeit(lambda: json.dumps(obj, default=_default).encode('utf-8'), args.repeat)
+        fast_ms, fast_out = timeit(lambda: dumps_bytes(obj), args.repeat)
+        gz = len(gzip.compress(fast_out, compresslevel=6))
+        print(f"{name:<15}{len(fast_out):>10}{gz:>10}{std_ms:>12.2f}{fast_ms:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
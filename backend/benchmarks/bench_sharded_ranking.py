@@ -0,0 +1,64 @@
+"""Benchmark sharded scatter-gather ranking against per-pair scoring.
+
+Run from the backend directory:
+    python -m benchmarks.bench_sharded_ranking --candidates 20000 --shards 1 2 4
+"""
+import argparse
+import os
+import random
+import time
+
+from app.utils.match_engine import AIMatchEngine
+from app.utils.sharded_ranking import ShardedRanker
+
+WORDS = ['python', 'django', 'react', 'aws', 'docker', 'kubernetes', 'sql', 'team', 'experience',
+         'developed', 'designed', 'rest', 'apis', 'cloud', 'agile', 'testing', 'led', 'migrated',
+         'java', 'spring', 'terraform', 'redis', 'postgresql', 'linux', 'git', 'jenkins']
+SKILLS = ['python', 'django', 'react', 'aws', 'docker', 'kubernetes', 'java', 'spring',
+          'terraform', 'redis', 'postgresql', 'linux', 'git', 'jenkins']
+
+
+def synthetic_corpus(count, words, seed=0):
+    rng = random.Random(seed)
+    return [(f'c{i}', ' '.join(rng.choice(WORDS) for _ in range(words))) for i in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--candidates', type=int, default=20000)
+    parser.add_argument('--words', type=int, default=300)
+    parser.add_argument('--shards', type=int, nargs='+', default=[1, 2, 4, os.cpu_count() or 1])
+    parser.add_argument('--queries', type=int, default=20)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--baseline-pairs', type=int, default=500, help='pairs scored one by one for comparison')
+    args = parser.parse_args()
+
+    corpus = synthetic_corpus(args.candidates, args.words)
+    rng = random.Random(1)
+    queries = ['We are hiring: ' + ' '.join(rng.choice(WORDS) for _ in range(60)) for _ in range(args.queries)]
+    engine = AIMatchEngine()
+
+    # Per-pair baseline, extrapolated to the full corpus
+    job = {'data': {'original_text': queries[0], 'skills': {}}}
+    start = time.perf_counter()
+    for _, text in corpus[:args.baseline_pairs]:
+        engine.calculate_comprehensive_match({'data': {'raw_text': text}}, job)
+    per_pair = (time.perf_counter() - start) / args.baseline_pairs
+    print(f"per-pair scoring: {per_pair * 1000:.2f} ms/pair -> ~{per_pair * args.candidates:.1f} s per query")
+
+    print(f"{'shards':>7}{'build s':>9}{'query ms':>10}{'queries/s':>11}")
+    for shards in args.shards:
+        start = time.perf_counter()
+        ranker = ShardedRanker(shards, engine=engine, skills=SKILLS).build(corpus)
+        build = time.perf_counter() - start
+        with ranker:
+            ranker.rank(queries[0], args.k)  # warm-up
+            start = time.perf_counter()
+            for query in queries:
+                ranker.rank(query, args.k)
+            elapsed = time.perf_counter() - start
+        print(f"{shards:>7}{build:>9.2f}{elapsed / len(queries) * 1000:>10.1f}{len(queries) / elapsed:>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
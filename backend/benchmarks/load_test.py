@@ -0,0 +1,373 @@
+"""Replay a mixed API workload against create_app() running under a pre-fork WSGI server.
+
+Forks --workers server processes sharing one listening socket (each builds
+its own app, like gunicorn sync workers), drives them with an open-loop
+asyncio client at --rps and writes a JSON report with throughput, latency
+percentiles, error rates and per-worker RSS. Run from the backend directory:
+    python -m benchmarks.load_test --workers 4 --rps 20 --duration 30 --output report.json
+    python -m benchmarks.load_test --baseline report.json   # compare with an earlier run
+Use --url to target a server that is already running instead. Repeated
+documents are answered from the parse cache; pass --no-artifact-cache to
+make every upload and job analysis do the full work.
+"""
+import argparse
+import asyncio
+import io
+import json
+import multiprocessing
+import os
+import platform
+import queue
+import random
+import socket
+import subprocess
+import sys
+import time
+from collections import Counter, defaultdict
+
+import httpx
+
+os.environ.setdefault('MAX_CONTENT_LENGTH', str(16 * 1024 * 1024))
+
+from benchmarks.pdf_corpus import pdf_bytes
+
+DEFAULT_MIX = 'upload-resume=2,analyze-job=2,match-score=4,match-score-custom=2'
+
+WORDS = ['python', 'django', 'react', 'aws', 'docker', 'kubernetes', 'sql', 'team', 'experience',
+         'developed', 'designed', 'rest', 'apis', 'cloud', 'agile', 'testing', 'led', 'migrated',
+         'java', 'spring', 'terraform', 'redis', 'postgresql', 'linux', 'git', 'jenkins']
+
+
+def synthetic_job(rng, words=120):
+    body = ' '.join(rng.choice(WORDS) for _ in range(words))
+    requirements = ' '.join(rng.choice(WORDS) for _ in range(20))
+    return f"We are looking for a software engineer. {body}.\nRequirements: {requirements}."
+
+
+def synthetic_resume(rng, words=400):
+    return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+
+def parse_mix(spec):
+    mix = {}
+    for part in spec.split(','):
+        name, _, weight = part.partition('=')
+        mix[name.strip()] = float(weight or 1)
+    unknown = set(mix) - {'upload-resume', 'analyze-job', 'match-score', 'match-score-custom'}
+    if unknown:
+        raise ValueError(f"Unknown endpoints in mix: {', '.join(sorted(unknown))}")
+    return mix
+
+
+# Server side
+
+def _serve(fd, config_name, threaded, warmup, ready):
+    from werkzeug.serving import make_server, WSGIRequestHandler
+    from app import create_app
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_request(self, *args, **kwargs):
+            pass
+
+    app = create_app(config_name)
+    if warmup:
+        # Store a resume and job in this worker before it accepts traffic, so /match-score
+        # never fails just because the shared socket routed the warm-up elsewhere
+        pdf, job_text = warmup
+        api = os.environ.get('API_PREFIX', '/api')
+        client = app.test_client()
+        responses = [
+            client.post(f'{api}/upload-resume', data={'resume': (io.BytesIO(pdf), 'resume.pdf')},
+                        content_type='multipart/form-data'),
+            client.post(f'{api}/analyze-job', json={'job_description': job_text})
+        ]
+        for response in responses:
+            if response.status_code != 200:
+                print(f"Worker {os.getpid()} warm-up failed: {response.status_code} {response.get_data(as_text=True)}",
+                      file=sys.stderr)
+    ready.put(os.getpid())
+    server = make_server('127.0.0.1', 0, app, threaded=threaded, request_handler=QuietHandler, fd=fd)
+    server.serve_forever()
+
+
+class PreforkServer:
+    """Binds one socket, then forks workers that all accept() on it"""
+
+    def __init__(self, workers, config_name='production', threaded=False, warmup=None):
+        self.workers = workers
+        self.config_name = config_name
+        self.threaded = threaded
+        self.warmup = warmup
+        self.processes = []
+        self.sock = None
+        self._ready = None
+
+    def start(self):
+        self.sock = socket.create_server(('127.0.0.1', 0), backlog=1024)
+        self.sock.set_inheritable(True)
+        context = multiprocessing.get_context('fork')
+        self._ready = context.Queue()
+        for _ in range(self.workers):
+            process = context.Process(target=_serve,
+                                      args=(self.sock.fileno(), self.config_name, self.threaded, self.warmup,
+                                            self._ready),
+                                      daemon=True)
+            process.start()
+            self.processes.append(process)
+        return self
+
+    def wait_ready(self, timeout=300):
+        """Block until every worker has built its app and finished warming up"""
+        deadline = time.monotonic() + timeout
+        for _ in range(self.workers):
+            try:
+                self._ready.get(timeout=max(0, deadline - time.monotonic()))
+            except queue.Empty:
+                raise SystemExit(f"Workers did not finish warming up within {timeout}s")
+        return self
+
+    @property
+    def url(self):
+        host, port = self.sock.getsockname()[:2]
+        return f'http://{host}:{port}'
+
+    def stop(self):
+        for process in self.processes:
+            process.terminate()
+        for process in self.processes:
+            process.join(timeout=5)
+        self.sock.close()
+
+    def memory(self):
+        return [dict(pid=process.pid, **read_rss(process.pid)) for process in self.processes]
+
+
+def read_rss(pid):
+    """Current and peak resident set size in MB (Linux /proc)"""
+    usage = {'rss_mb': None, 'peak_rss_mb': None}
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    usage['rss_mb'] = round(int(line.split()[1]) / 1024, 1)
+                elif line.startswith('VmHWM:'):
+                    usage['peak_rss_mb'] = round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return usage
+
+
+# Client side
+
+class Workload:
+    """Synthetic documents and request builders for each endpoint in the mix"""
+
+    def __init__(self, api, corpus_size, pages, seed):
+        rng = random.Random(seed)
+        self.api = api
+        self.rng = rng
+        self.pdfs = [pdf_bytes(pages, seed=seed + i) for i in range(corpus_size)]
+        self.jobs = [synthetic_job(rng) for _ in range(corpus_size)]
+        self.resumes = [synthetic_resume(rng) for _ in range(corpus_size)]
+
+    def request(self, endpoint):
+        rng = self.rng
+        if endpoint == 'upload-resume':
+            return 'POST', f'{self.api}/upload-resume', {
+                'files': {'resume': ('resume.pdf', rng.choice(self.pdfs), 'application/pdf')}
+            }
+        if endpoint == 'analyze-job':
+            return 'POST', f'{self.api}/analyze-job', {'json': {'job_description': rng.choice(self.jobs)}}
+        if endpoint == 'match-score':
+            return 'POST', f'{self.api}/match-score', {}
+        return 'POST', f'{self.api}/match-score-custom', {
+            'json': {'resume_text': rng.choice(self.resumes), 'jb_text': rng.choice(self.jobs)}
+        }
+
+
+async def _send(client, workload, endpoint, scheduled, results):
+    method, url, kwargs = workload.request(endpoint)
+    try:
+        response = await client.request(method, url, **kwargs)
+        status = response.status_code
+    except httpx.HTTPError as e:
+        status = type(e).__name__
+    results.append((endpoint, status, (time.perf_counter() - scheduled) * 1000))
+
+
+async def run_load(url, workload, mix, rps, duration, connections, timeout, warmup):
+    limits = httpx.Limits(max_connections=connections, max_keepalive_connections=connections)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=timeout) as client:
+        # External server: give it a stored resume and job so /match-score has something to score
+        warm = []
+        for _ in range(warmup):
+            for endpoint in ('upload-resume', 'analyze-job'):
+                warm.append(_send(client, workload, endpoint, time.perf_counter(), []))
+        await asyncio.gather(*warm)
+
+        endpoints, weights = zip(*mix.items())
+        results = []
+        tasks = []
+        total = int(rps * duration)
+        start = time.perf_counter()
+        for i in range(total):
+            # Open loop: arrivals follow the schedule even when responses lag behind
+            scheduled = start + i / rps
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            endpoint = workload.rng.choices(endpoints, weights)[0]
+            tasks.append(asyncio.create_task(_send(client, workload, endpoint, scheduled, results)))
+        await asyncio.gather(*tasks)
+        return results, time.perf_counter() - start
+
+
+def percentiles(latencies):
+    if not latencies:
+        return None
+    latencies = sorted(latencies)
+
+    def pick(q):
+        return round(latencies[min(len(latencies) - 1, int(q * len(latencies)))], 1)
+
+    return {
+        'p50': pick(0.50), 'p90': pick(0.90), 'p95': pick(0.95), 'p99': pick(0.99),
+        'max': round(latencies[-1], 1), 'mean': round(sum(latencies) / len(latencies), 1)
+    }
+
+
+def summarize(results, elapsed):
+    by_endpoint = defaultdict(list)
+    for endpoint, status, latency in results:
+        by_endpoint[endpoint].append((status, latency))
+
+    def section(entries):
+        statuses = Counter(str(status) for status, _ in entries)
+        ok = [latency for status, latency in entries if status == 200]
+        return {
+            'requests': len(entries),
+            'ok': len(ok),
+            'error_rate': round(1 - len(ok) / len(entries), 4) if entries else 0.0,
+            'throughput_rps': round(len(ok) / elapsed, 2),
+            'status_counts': dict(sorted(statuses.items())),
+            'latency_ms': percentiles(ok)
+        }
+
+    overall = section([(status, latency) for _, status, latency in results])
+    overall['endpoints'] = {name: section(entries) for name, entries in sorted(by_endpoint.items())}
+    return overall
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(report, baseline):
+    """Print throughput / error-rate / p99 changes against an earlier report"""
+    print(f"{'endpoint':<20}{'rps':>16}{'error rate':>20}{'p99 ms':>20}")
+    rows = [('overall', report['results'], baseline['results'])]
+    for name, section in report['results']['endpoints'].items():
+        if name in baseline['results']['endpoints']:
+            rows.append((name, section, baseline['results']['endpoints'][name]))
+    for name, new, old in rows:
+        new_p99 = (new['latency_ms'] or {}).get('p99')
+        old_p99 = (old['latency_ms'] or {}).get('p99')
+        print(f"{name:<20}{old['throughput_rps']:>8} -> {new['throughput_rps']:<6}"
+              f"{old['error_rate']:>10} -> {new['error_rate']:<6}{str(old_p99):>10} -> {new_p99}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--threaded', action='store_true', help='serve requests on threads inside each worker')
+    parser.add_argument('--config', default='production', help='create_app() configuration name')
+    parser.add_argument('--url', help='target an already running server instead of forking workers')
+    parser.add_argument('--rps', type=float, default=10)
+    parser.add_argument('--duration', type=float, default=30)
+    parser.add_argument('--mix', default=DEFAULT_MIX, help='endpoint=weight pairs')
+    parser.add_argument('--connections', type=int, default=100)
+    parser.add_argument('--timeout', type=float, default=30)
+    parser.add_argument('--corpus', type=int, default=50, help='distinct synthetic documents per type')
+    parser.add_argument('--pages', type=int, default=2, help='pages per synthetic resume PDF')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-artifact-cache', action='store_true',
+                        help='disable the parse/analysis cache in forked workers (sets ARTIFACT_CACHE_SIZE=0)')
+    parser.add_argument('--label', help='free-form name stored in the report')
+    parser.add_argument('--output', help='write the JSON report here (default: stdout)')
+    parser.add_argument('--baseline', help='earlier JSON report to compare against')
+    args = parser.parse_args()
+
+    mix = parse_mix(args.mix)
+    api = os.environ.get('API_PREFIX', '/api')
+    workload = Workload(api, args.corpus, args.pages, args.seed)
+    if args.no_artifact_cache:
+        # Inherited by the forked workers before they build their processors
+        os.environ['ARTIFACT_CACHE_SIZE'] = '0'
+
+    server = None
+    url = args.url
+    if not url:
+        # Each worker is warmed in-process, so the client-side warm-up is only needed for --url
+        server = PreforkServer(args.workers, args.config, args.threaded,
+                               warmup=(workload.pdfs[0], workload.jobs[0])).start().wait_ready()
+        url = server.url
+
+    try:
+        for _ in range(100):
+            try:
+                if httpx.get(f'{url}{api}/health', timeout=1).status_code == 200:
+                    break
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.2)
+        else:
+            raise SystemExit(f"Server at {url} did not become healthy")
+
+        results, elapsed = asyncio.run(run_load(
+            url, workload, mix, args.rps, args.duration, args.connections, args.timeout,
+            warmup=0 if server else 2
+        ))
+        workers = server.memory() if server else []
+    finally:
+        if server:
+            server.stop()
+
+    report = {
+        'label': args.label,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'git_revision': git_revision(),
+        'environment': {'python': platform.python_version(), 'cpus': os.cpu_count(), 'platform': sys.platform},
+        'config': {
+            'workers': args.workers if server else None,
+            'threaded': args.threaded,
+            'target_rps': args.rps,
+            'duration_s': args.duration,
+            'mix': mix,
+            'corpus': args.corpus,
+            'pages': args.pages,
+            'seed': args.seed,
+            'artifact_cache': not args.no_artifact_cache
+        },
+        'elapsed_s': round(elapsed, 2),
+        'results': summarize(results, elapsed),
+        'workers': workers
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(report, json.load(f))
+
+
+if __name__ == '__main__':
+    main()
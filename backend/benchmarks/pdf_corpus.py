@@ -0,0 +1,55 @@
+"""Generate simple text PDFs for extraction benchmarks (no PDF library required)."""
+import random
+
+WORDS = ['Python', 'Django', 'React', 'AWS', 'Docker', 'Kubernetes', 'SQL', 'team', 'experience',
+         'developed', 'designed', 'REST', 'APIs', 'cloud', 'Agile', 'testing', 'led', 'migrated']
+
+
+def _escape(text):
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def pdf_bytes(pages, lines_per_page=45, seed=0):
+    rng = random.Random(seed)
+    objects = []
+
+    def add(body):
+        objects.append(body)
+        return len(objects)
+
+    font = add(b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>')
+    pages_id = len(objects) + 1 + 2 * pages  # reserved after page/content objects
+    page_ids = []
+    for _ in range(pages):
+        lines = ['BT /F1 10 Tf 50 780 Td 14 TL']
+        for _ in range(lines_per_page):
+            line = ' '.join(rng.choice(WORDS) for _ in range(12))
+            lines.append(f'({_escape(line)}) Tj T*')
+        lines.append('ET')
+        stream = '\n'.join(lines).encode('latin-1')
+        content = add(b'<< /Length %d >>\nstream\n' % len(stream) + stream + b'\nendstream')
+        page_ids.append(add(
+            b'<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 792] '
+            b'/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>' % (pages_id, font, content)
+        ))
+    kids = ' '.join(f'{pid} 0 R' for pid in page_ids).encode()
+    add(b'<< /Type /Pages /Kids [%s] /Count %d >>' % (kids, pages))
+    catalog = add(b'<< /Type /Catalog /Pages %d 0 R >>' % pages_id)
+
+    out = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b'%d 0 obj\n' % number + body + b'\nendobj\n'
+    xref = len(out)
+    out += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    for offset in offsets:
+        out += b'%010d 00000 n \n' % offset
+    out += b'trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, catalog, xref)
+    return bytes(out)
+
+
+def make_pdf(path, pages, lines_per_page=45, seed=0):
+    with open(path, 'wb') as f:
+        f.write(pdf_bytes(pages, lines_per_page, seed))
+    return path
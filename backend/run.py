@@ -4,8 +4,8 @@ import os
 
 load_dotenv()
 
-app = create_app()
-
+# Only build the app when run directly: PDF worker processes re-import this module
 if __name__ == '__main__':
+    app = create_app()
     PORT = int(os.getenv("FLASK_PORT"))
     app.run(host = '0.0.0.0', debug = True, port = PORT)
\ No newline at end of file